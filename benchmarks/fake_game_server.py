@@ -0,0 +1,79 @@
+"""Minimal local game server for benchmarks.
+
+Answers a join with the full game state and then broadcasts an `update`
+frame with a few moved food items to every connection each tick. It does
+not simulate the game, it only produces realistic traffic.
+
+    python -m benchmarks.fake_game_server --port 8765 --food 1000
+"""
+import argparse
+import asyncio
+import json
+import random
+
+import websockets
+
+
+class FakeGameServer:
+    def __init__(self, food: int = 1000, tick: float = 0.03, world_size: float = 5000.0, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.tick = tick
+        self.world_size = world_size
+        self.food = [self._food(i) for i in range(food)]
+        self.players = {}
+        self.connections = set()
+
+    def _food(self, index: int) -> dict:
+        return {
+            "index": index,
+            "circle": {"x": self.rng.uniform(0, self.world_size), "y": self.rng.uniform(0, self.world_size), "radius": 5},
+        }
+
+    async def handler(self, ws):
+        try:
+            async for frame in ws:
+                message = json.loads(frame)
+                if message["type"] == "join":
+                    name = message["data"]["playerName"]
+                    self.players[name] = {
+                        "playerName": name,
+                        "alive": True,
+                        "circle": {"x": self.world_size / 2, "y": self.world_size / 2, "radius": 10},
+                    }
+                    await ws.send(json.dumps({
+                        "type": "gameState",
+                        "data": {"players": list(self.players.values()), "food": self.food},
+                    }))
+                    # only joined players receive updates
+                    self.connections.add(ws)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(ws)
+
+    async def broadcast(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            eaten = [self._food(self.rng.randrange(len(self.food))) for _ in range(5)]
+            for f in eaten:
+                self.food[f["index"]] = f
+            frame = json.dumps({"type": "update", "data": {"players": [], "food": eaten}})
+            websockets.broadcast(self.connections, frame)
+
+    async def serve(self, host: str, port: int):
+        async with websockets.serve(self.handler, host, port, ping_interval=None):
+            await self.broadcast()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--food", type=int, default=1000)
+    parser.add_argument("--tick", type=float, default=0.03)
+    args = parser.parse_args()
+    asyncio.run(FakeGameServer(food=args.food, tick=args.tick).serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
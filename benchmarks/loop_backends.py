@@ -0,0 +1,133 @@
+"""Compare event loop backends running bots against a local fake game server.
+
+For each backend a fresh worker process runs N bots for a fixed duration and
+reports event loop lag, messages per second and CPU usage.
+
+    python -m benchmarks.loop_backends --bots 200 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def _measure_lag(interval: float, samples: list):
+    """Record how late a periodic sleep wakes up"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def _run_bots(port: int, bots: int, duration: float, strategy: str) -> dict:
+    from src.bot.game_client import GameClient
+
+    clients = [
+        GameClient("bench", f"bot-{i}", strategy=strategy, game_port=port, slow_tick_threshold=0)
+        for i in range(bots)
+    ]
+    tasks = [asyncio.create_task(client.run()) for client in clients]
+    # let every bot connect and receive the initial game state before measuring
+    await asyncio.sleep(min(5.0, 1.0 + bots / 200))
+
+    lag = []
+    lag_task = asyncio.create_task(_measure_lag(0.01, lag))
+    messages_before = sum(c.messages_received for c in clients)
+    sent_before = sum(c.messages_sent for c in clients)
+    cpu_before = _cpu_seconds()
+    started = time.perf_counter()
+    await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - started
+    cpu = _cpu_seconds() - cpu_before
+    received = sum(c.messages_received for c in clients) - messages_before
+    sent = sum(c.messages_sent for c in clients) - sent_before
+
+    lag_task.cancel()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    lag.sort()
+    return {
+        "connected": sum(1 for c in clients if c.player_data),
+        "lag_mean_ms": statistics.fmean(lag) * 1000 if lag else 0.0,
+        "lag_p99_ms": lag[int(len(lag) * 0.99)] * 1000 if lag else 0.0,
+        "received_per_sec": received / elapsed,
+        "sent_per_sec": sent / elapsed,
+        "cpu_percent": cpu / elapsed * 100,
+    }
+
+
+def run_worker(backend: str, port: int, bots: int, duration: float, strategy: str):
+    import logging
+
+    from src.main import get_loop_factory
+
+    logging.basicConfig(level=logging.ERROR)
+    with asyncio.Runner(loop_factory=get_loop_factory(backend)) as runner:
+        result = runner.run(_run_bots(port, bots, duration, strategy))
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--food", type=int, default=1000)
+    parser.add_argument("--strategy", default="greedy")
+    parser.add_argument("--backends", default="asyncio,uvloop")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.port, args.bots, args.duration, args.strategy)
+        return
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_game_server", "--port", str(port), "--food", str(args.food)]
+    )
+    try:
+        time.sleep(1.0)
+        print(f"{args.bots} bots, {args.food} food, {args.duration:.0f}s per backend")
+        print(f"{'backend':<10}{'bots':>6}{'lag mean':>11}{'lag p99':>10}{'recv/s':>10}{'sent/s':>10}{'cpu':>8}")
+        for backend in args.backends.split(","):
+            worker = subprocess.run(
+                [sys.executable, "-m", "benchmarks.loop_backends", "--worker", backend, "--port", str(port),
+                 "--bots", str(args.bots), "--duration", str(args.duration), "--strategy", args.strategy],
+                capture_output=True,
+                text=True,
+                env=dict(os.environ, LOG_LEVEL="ERROR"),
+            )
+            if worker.returncode != 0:
+                print(f"{backend:<10} failed: {worker.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(worker.stdout.strip().splitlines()[-1])
+            print(f"{backend:<10}{r['connected']:>6}{r['lag_mean_ms']:>9.2f}ms{r['lag_p99_ms']:>8.2f}ms"
+                  f"{r['received_per_sec']:>10.0f}{r['sent_per_sec']:>10.0f}{r['cpu_percent']:>7.1f}%")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure bot service import time and time-to-ready.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def import_time(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter, in seconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def time_to_ready(timeout: float = 30.0) -> float:
+    """Seconds from process start until /health/ready returns 200"""
+    http_port = _free_port()
+    env = dict(os.environ, HTTP_PORT=str(http_port), GRPC_PORT=str(_free_port()), LOG_LEVEL="WARNING")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.main"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://localhost:{http_port}/health/ready", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if process.poll() is not None:
+                raise RuntimeError(f"Service exited with code {process.returncode}")
+            time.sleep(0.01)
+        raise TimeoutError("Service did not become ready")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    modules = ["src.main", "src.bot.service", "fastapi", "uvicorn", "grpc"]
+    for module in modules:
+        samples = [import_time(module) for _ in range(args.runs)]
+        print(f"import {module:<20} median {statistics.median(samples) * 1000:8.1f}ms")
+
+    samples = [time_to_ready() for _ in range(args.runs)]
+    print(f"time to ready              median {statistics.median(samples) * 1000:8.1f}ms "
+          f"(min {min(samples) * 1000:.1f}ms, max {max(samples) * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
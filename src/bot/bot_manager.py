@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import sys
 from typing import Dict, Optional
 from uuid import UUID, uuid4
 
@@ -10,14 +11,17 @@ from src.config.settings import Settings
 logger = logging.getLogger(__name__)
 
 class BotInstance:
+    __slots__ = ("id", "name", "game_id", "strategy", "host_name", "game_port", "client", "task")
+
     def __init__(self, game_id: str, name: str, strategy: str = "random", host_name: str = "localhost", game_port: int = 8080):
         self.id = uuid4()
         self.name = name
-        self.game_id = game_id
-        self.strategy = strategy
-        self.host_name = host_name
+        # shared across all bots with the same game, strategy and host
+        self.game_id = sys.intern(game_id)
+        self.strategy = sys.intern(strategy)
+        self.host_name = sys.intern(host_name)
         self.game_port = game_port
-        self.client = None
+        self.client: Optional[GameClient] = None
         self.task: Optional[asyncio.Task] = None
         
     async def start(self):
@@ -28,7 +32,6 @@ class BotInstance:
             strategy=self.strategy,
             host_name=self.host_name,
             game_port=self.game_port,
-            bot_id=self.id
         )
         self.task = asyncio.create_task(self._run())
         
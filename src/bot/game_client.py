@@ -1,23 +1,57 @@
 import asyncio
-import json
 import logging
 import websockets
 from typing import Optional
 import math
 import random
-from src.config.settings import Settings
+import sys
+import time
+from collections import deque
+from enum import Enum
+from src.config.settings import get_settings
+from .kernels import normalize
+from .protocol import JSON_CODEC, JSON_SUBPROTOCOL, PROTOBUF_SUBPROTOCOL, codec_for_subprotocol
+from .world import GameWorld
 
-settings = Settings()
-
-# Configure logging
-logging.basicConfig(level=settings.log_level, format='{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}')
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
 
+# Smoothing factor of the moving average of update inter-arrival times
+UPDATE_INTERVAL_SMOOTHING = 0.1
+# Bounds for how long the game loop waits for the next update
+MIN_UPDATE_WAIT = 0.05
+MAX_UPDATE_WAIT = 1.0
+
+
+class RespawnState(Enum):
+    """Lifecycle of the bot's player in the game."""
+
+    DEAD = "dead"
+    JOIN_PENDING = "join_pending"
+    ALIVE = "alive"
+
+
 class GameClient:
     """Client for connecting to and interacting with the game server."""
 
+    # Slotted to keep per-bot memory small; the game state itself lives in a
+    # GameWorld shared by all bots of the same game.
+    __slots__ = (
+        "game_id", "player_name", "strategy", "ws", "connected", "player_data", "world",
+        "host_name", "game_port", "running", "access_token",
+        "respawn_state", "respawn_delay", "respawn_timeout", "died_at", "join_sent_at",
+        "join_messages_sent", "join_retries", "respawns", "last_respawn_latency", "total_respawn_latency",
+        "send_queue_size", "_control_queue", "_move_queue", "_outbox_ready", "_writer_task",
+        "messages_sent", "dropped_moves", "protocol", "codec", "bytes_received",
+        "decode_seconds", "update_seconds", "move_seconds", "max_tick_seconds",
+        "messages_received", "moves_calculated", "slow_tick_threshold",
+        "difficulty", "decision_every", "update_interval", "last_update_at",
+        "_updates_since_decision", "_update_event", "rng", "moves_sent", "last_message_at",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         game_id: str,
@@ -26,34 +60,109 @@ class GameClient:
         host_name: str = "localhost",
         game_port: int = 8080,
         access_token: str = None,
+        respawn_delay: Optional[float] = None,
+        respawn_timeout: Optional[float] = None,
+        send_queue_size: Optional[int] = None,
+        protocol: Optional[str] = None,
+        slow_tick_threshold: Optional[float] = None,
+        difficulty: str = "",
+        rng: Optional[random.Random] = None,
     ):
-        self.game_id = game_id
+        # ids and strategy names repeat across many bots, share one copy of each
+        self.game_id = sys.intern(game_id)
         self.player_name = player_name
-        self.strategy = strategy
+        self.strategy = sys.intern(strategy)
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self.connected = False
         self.player_data = None
-        self.game_state = {
-            "food": [],
-            "players": {},
-        }
-        self.host_name = host_name
+        self.host_name = sys.intern(host_name)
         self.game_port = game_port
-        self.target_food = None
+        self.world = GameWorld.for_game(self.host_name, game_port, self.game_id)
         self.running = False
         self.access_token = access_token
+
+        # Respawn state machine: dead -> join_pending -> alive
+        self.respawn_state = RespawnState.DEAD
+        self.respawn_delay = settings.respawn_delay if respawn_delay is None else respawn_delay
+        self.respawn_timeout = settings.respawn_timeout if respawn_timeout is None else respawn_timeout
+        self.died_at: Optional[float] = None
+        self.join_sent_at: Optional[float] = None
+
+        # Respawn metrics
+        self.join_messages_sent = 0
+        self.join_retries = 0
+        self.respawns = 0
+        self.last_respawn_latency: Optional[float] = None
+        self.total_respawn_latency = 0.0
+
+        # Outbound queue drained by a single writer task. Moves are superseded by
+        # newer ones so only the latest few are kept; control messages (join) are
+        # always delivered.
+        self.send_queue_size = settings.send_queue_size if send_queue_size is None else send_queue_size
+        # created on first use, idle bots do not pay for them
+        self._control_queue: Optional[deque] = None
+        self._move_queue: Optional[deque] = None
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self.messages_sent = 0
+        self.moves_sent = 0
+        self.dropped_moves = 0
+
+        # Wire protocol, "protobuf" is negotiated with the server and falls back to JSON
+        self.protocol = settings.game_protocol if protocol is None else protocol
+        self.codec = JSON_CODEC
+        self.bytes_received = 0
+        # monotonic time of the last frame from the server, for ListBots
+        self.last_message_at: Optional[float] = None
+
+        # CPU accounting, time spent in synchronous sections is attributed to this bot
+        self.decode_seconds = 0.0
+        self.update_seconds = 0.0
+        self.move_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self.messages_received = 0
+        self.moves_calculated = 0
+        self.slow_tick_threshold = (
+            settings.slow_tick_threshold_ms / 1000 if slow_tick_threshold is None else slow_tick_threshold
+        )
+
+        # Decisions are made right after server updates, every n-th update
+        # depending on difficulty
+        self.difficulty = sys.intern(difficulty)
+        self.decision_every = max(1, settings.decision_every.get(difficulty, 1))
+        self.update_interval: Optional[float] = None
+        self.last_update_at: Optional[float] = None
+        self._updates_since_decision = 0
+        self._update_event: Optional[asyncio.Event] = None
+        # random source of the random strategy, seeded for simulations
+        self.rng = random if rng is None else rng
         logger.info(f"Created game client for game {game_id}")
 
+    @property
+    def game_state(self) -> dict:
+        """Food and players of the game, shared with the other bots in it."""
+        return self.world.state
+
+    @property
+    def alive(self) -> bool:
+        """Whether the bot's player is in the game."""
+        return self.respawn_state is RespawnState.ALIVE
+
     async def connect(self):
         """Connect to the game server."""
         try:
             logger.info(f"Connecting to game {self.game_id}")
+            subprotocols = None
+            if self.protocol == "protobuf":
+                subprotocols = [PROTOBUF_SUBPROTOCOL, JSON_SUBPROTOCOL]
             self.ws = await websockets.connect(
                 f"ws://{self.host_name}:{self.game_port}/connect/{self.game_id}?token={self.access_token}",
                 ping_interval=None,
+                subprotocols=subprotocols,
             )
+            self.codec = codec_for_subprotocol(self.ws.subprotocol)
             self.connected = True
-            logger.info(f"Connected to game {self.game_id}")
+            logger.info(f"Connected to game {self.game_id} using {self.codec.name} protocol")
 
             await self.send_join_message()
             return True
@@ -68,17 +177,173 @@ class GameClient:
         """Send a join message to the game server."""
         logger.info(f"Sending join message as {self.player_name}")
         join_msg = {"type": "join", "data": {"playerName": self.player_name}}
+        self.respawn_state = RespawnState.JOIN_PENDING
+        self.join_sent_at = time.monotonic()
+        self.join_messages_sent += 1
         await self.send_message(join_msg)
 
+    def _advance_respawn(self, now: float) -> bool:
+        """Advance the respawn state machine, returning True when a join should be sent."""
+        if self.player_data and self.player_data["alive"]:
+            if self.respawn_state is not RespawnState.ALIVE:
+                if self.died_at is not None:
+                    latency = now - self.died_at
+                    self.respawns += 1
+                    self.last_respawn_latency = latency
+                    self.total_respawn_latency += latency
+                    logger.debug(f"Bot {self.player_name} respawned after {latency:.3f}s")
+                self.respawn_state = RespawnState.ALIVE
+                self.died_at = None
+            return False
+
+        if self.respawn_state is RespawnState.ALIVE and self.player_data:
+            # We were alive and the server now reports us dead
+            self.respawn_state = RespawnState.DEAD
+            self.died_at = now
+
+        if self.respawn_state is RespawnState.DEAD:
+            return self.died_at is None or now - self.died_at >= self.respawn_delay
+
+        if self.respawn_state is RespawnState.JOIN_PENDING:
+            if self.join_sent_at is not None and now - self.join_sent_at >= self.respawn_timeout:
+                logger.info(f"Join for {self.player_name} not acknowledged after {self.respawn_timeout}s, retrying")
+                self.join_retries += 1
+                return True
+
+        return False
+
+    async def update_respawn(self):
+        """Send a join message if the respawn state machine calls for one."""
+        if self._advance_respawn(time.monotonic()):
+            await self.send_join_message()
+
+    @property
+    def average_respawn_latency(self) -> Optional[float]:
+        """Mean time from death to being alive again, in seconds."""
+        if not self.respawns:
+            return None
+        return self.total_respawn_latency / self.respawns
+
     async def send_message(self, message: dict):
-        """Send a message to the game server."""
+        """Queue a message for the game server without waiting for the network."""
         if not self.ws:
             return
-        try:
-            await self.ws.send(json.dumps(message))
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
-            self.connected = False
+        if self._outbox_ready is None:
+            self._create_outbox()
+        if message["type"] == "move":
+            if len(self._move_queue) >= self.send_queue_size:
+                # drop the oldest move, it has been superseded
+                self._move_queue.popleft()
+                self.dropped_moves += 1
+            self._move_queue.append(message)
+        else:
+            self._control_queue.append(message)
+        self._outbox_ready.set()
+
+    def take_messages(self) -> list:
+        """Remove and return all queued messages, control messages first, bypassing the writer."""
+        if self._outbox_ready is None:
+            return []
+        messages = list(self._control_queue) + list(self._move_queue)
+        self._control_queue.clear()
+        self._move_queue.clear()
+        return messages
+
+    def _create_outbox(self):
+        self._control_queue = deque()
+        self._move_queue = deque()
+        self._outbox_ready = asyncio.Event()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of messages waiting to be sent."""
+        if self._outbox_ready is None:
+            return 0
+        return len(self._control_queue) + len(self._move_queue)
+
+    async def write_messages(self):
+        """Send queued messages to the game server, control messages first."""
+        if not self.ws:
+            return
+        if self._outbox_ready is None:
+            self._create_outbox()
+
+        while True:
+            if not self._control_queue and not self._move_queue:
+                self._outbox_ready.clear()
+                await self._outbox_ready.wait()
+                continue
+            if self._control_queue:
+                message = self._control_queue.popleft()
+            else:
+                message = self._move_queue.popleft()
+            try:
+                await self.ws.send(self.codec.encode(message))
+                self.messages_sent += 1
+                if message["type"] == "move":
+                    self.moves_sent += 1
+            except Exception as e:
+                logger.error(f"Error sending message: {e}")
+                self.connected = False
+                return
+
+    def apply_message(self, message: dict, world: Optional[GameWorld] = None):
+        """Apply a decoded game server message to a game world, the shared one by default."""
+        world = self.world if world is None else world
+        msg_type = message["type"]
+        data = message["data"]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received message: {message} of type {msg_type}")
+
+        if msg_type == "gameState":
+            # reset game state
+            world.reset(data)
+
+        elif msg_type == "update":
+            # Update players and food
+            world.update(data)
+
+        elif msg_type == "spawn":
+            # Add new player or update existing player
+            world.spawn(data)
+
+    def _spawn_own_player(self, data: dict):
+        for player in data.get("players", ()):
+            if player["playerName"] == self.player_name:
+                self.world.spawn(player)
+                return
+
+    async def handle_frame(self, frame):
+        """Decode and handle one frame from the game server."""
+        started = time.perf_counter()
+        self.bytes_received += len(frame)
+        message = self.codec.decode(frame)
+        await self.handle_message(message, time.perf_counter() - started)
+
+    async def handle_message(self, message: dict, decode_seconds: float = 0.0):
+        """Handle one decoded message from the game server, applying it if this bot feeds a world.
+
+        The message is only read, so bots receiving the same frame may share
+        one decoded copy.
+        """
+        started = time.perf_counter()
+        self.last_message_at = time.monotonic()
+        msg_type = message["type"]
+        world = self.world.source(self, msg_type == "gameState")
+        if world is not None:
+            self.apply_message(message, world)
+        if world is not self.world:
+            # game states and spawns may only be sent to the joining bot, so
+            # every bot adds its own player to the shared world
+            if msg_type == "spawn":
+                self.apply_message(message)
+            elif msg_type == "gameState":
+                self._spawn_own_player(message["data"])
+        self.player_data = (world or self.world).player(self.player_name)
+        self.record_message_time(decode_seconds, time.perf_counter() - started)
+        self.record_frame(msg_type)
+        # handle death, rejoining at most once per respawn delay/timeout
+        await self.update_respawn()
 
     async def handle_messages(self):
         """Handle incoming messages from the game server."""
@@ -87,38 +352,8 @@ class GameClient:
 
         try:
             while True:
-                message = await self.ws.recv()
-                message = json.loads(message)
-                msg_type = message["type"]
-                data = message["data"]
-                logger.debug(f"Received message: {message} of type {msg_type}")
-
-                if msg_type == "gameState":
-                    # reset game state
-                    self.game_state = {}
-                    self.game_state["food"] = data.get("food", [])
-                    self.game_state["players"] = {p["playerName"]: p for p in data.get("players", [])}
-
-
-                elif msg_type == "update":
-                    # Update players
-                    for player in data.get("players", []):
-                        self.game_state["players"][player["playerName"]] = player
-
-                    # Update food
-                    for f in data.get("food", []):
-                        self.game_state["food"][f["index"]] = f
-
-                elif msg_type == "spawn":
-                    # Add new player or update existing player
-                    self.game_state["players"][data["playerName"]] = data
-
-                # update player data
-                self.player_data = self.game_state["players"].get(self.player_name, None)
-                # handle death
-                if self.player_data and not self.player_data["alive"]:
-                    # rejoin game
-                    await self.send_join_message()
+                frame = await self.ws.recv()
+                await self.handle_frame(frame)
 
         except websockets.exceptions.ConnectionClosed:
             logger.info("Connection closed")
@@ -126,6 +361,58 @@ class GameClient:
         except Exception as e:
             logger.error(f"Error handling messages: {e}")
             self.connected = False
+        finally:
+            # let another bot of the game keep the shared world up to date
+            self.world.release(self)
+
+    def record_frame(self, msg_type: str):
+        """Track the server's update cadence and wake the game loop after a new world state."""
+        if msg_type == "update":
+            now = time.monotonic()
+            if self.last_update_at is not None:
+                interval = now - self.last_update_at
+                if self.update_interval is None:
+                    self.update_interval = interval
+                else:
+                    self.update_interval += UPDATE_INTERVAL_SMOOTHING * (interval - self.update_interval)
+            self.last_update_at = now
+        elif msg_type != "gameState":
+            return
+        self._updates_since_decision += 1
+        if self._update_event is not None:
+            self._update_event.set()
+
+    def _update_timeout(self) -> float:
+        """How long the game loop waits for an update before checking on respawns."""
+        if self.update_interval is None:
+            return MAX_UPDATE_WAIT
+        return min(max(2 * self.update_interval, MIN_UPDATE_WAIT), MAX_UPDATE_WAIT)
+
+    def record_message_time(self, decode_seconds: float, update_seconds: float):
+        """Attribute the time spent on one incoming message to this bot."""
+        self.messages_received += 1
+        self.decode_seconds += decode_seconds
+        self.update_seconds += update_seconds
+        self._record_tick("message", decode_seconds + update_seconds)
+
+    def record_move_time(self, move_seconds: float):
+        """Attribute the time spent calculating one move to this bot."""
+        self.moves_calculated += 1
+        self.move_seconds += move_seconds
+        self._record_tick("move", move_seconds)
+
+    def _record_tick(self, kind: str, seconds: float):
+        if seconds > self.max_tick_seconds:
+            self.max_tick_seconds = seconds
+        if self.slow_tick_threshold and seconds >= self.slow_tick_threshold:
+            logger.warning(
+                f"Slow {kind} tick for bot {self.player_name} in game {self.game_id}: {seconds * 1000:.1f}ms"
+            )
+
+    @property
+    def cpu_seconds(self) -> float:
+        """Total time this bot spent decoding, updating state and calculating moves."""
+        return self.decode_seconds + self.update_seconds + self.move_seconds
 
     def calculate_move(self) -> tuple[float, float]:
         """Calculate the next move based on the current game state."""
@@ -134,45 +421,55 @@ class GameClient:
 
         if self.strategy == "random":
             # Random movement
-            angle = random.random() * 2 * math.pi
+            angle = self.rng.random() * 2 * math.pi
             return math.cos(angle), math.sin(angle)
 
         elif self.strategy == "greedy":
             # Find closest food that we can eat
-            closest_food = None
-            min_distance = float("inf")
-
-            for food in self.game_state["food"]:
-                dx = food["circle"]["x"] - self.player_data["circle"]["x"]
-                dy = food["circle"]["y"] - self.player_data["circle"]["y"]
-                distance = math.sqrt(dx * dx + dy * dy)
-
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_food = food
-
-            if closest_food:
-                dx = closest_food["circle"]["x"] - self.player_data["circle"]["x"]
-                dy = closest_food["circle"]["y"] - self.player_data["circle"]["y"]
-                magnitude = math.sqrt(dx * dx + dy * dy)
-                if magnitude == 0:
-                    return 0, 0
-                return dx / magnitude, dy / magnitude
+            x = self.player_data["circle"]["x"]
+            y = self.player_data["circle"]["y"]
+            food_index = self.world.food_index
+            closest_food = food_index.nearest(x, y)
+
+            if closest_food is not None:
+                food_x, food_y = food_index.position(closest_food)
+                return normalize(food_x - x, food_y - y)
 
         return 0, 0
 
+    async def decide(self):
+        """Calculate and send a move if enough updates arrived since the last decision."""
+        # easier bots think on fewer updates
+        if self._updates_since_decision < self.decision_every:
+            return
+        self._updates_since_decision = 0
+        if self.player_data and self.game_state:
+            started = time.perf_counter()
+            x, y = self.calculate_move()
+            self.record_move_time(time.perf_counter() - started)
+            move_msg = {"type": "move", "data": {"x": x, "y": y}}
+            await self.send_message(move_msg)
+
     async def game_loop(self):
         """Main game loop for the bot."""
         if not self.ws:
             return
 
+        if self._update_event is None:
+            self._update_event = asyncio.Event()
+
         try:
             while self.connected:
-                if self.player_data and self.game_state:
-                    x, y = self.calculate_move()
-                    move_msg = {"type": "move", "data": {"x": x, "y": y}}
-                    await self.send_message(move_msg)
-                await asyncio.sleep(0.03)  # 30ms delay to match server tick rate
+                # retry joins that the server has not acted on
+                await self.update_respawn()
+                # phase-lock to the server: decide right after an update arrives
+                try:
+                    async with asyncio.timeout(self._update_timeout()):
+                        await self._update_event.wait()
+                except TimeoutError:
+                    continue
+                self._update_event.clear()
+                await self.decide()
         except Exception as e:
             logger.error(f"Error in game loop: {e}")
             self.connected = False
@@ -185,12 +482,22 @@ class GameClient:
             raise ConnectionError(f"Failed to connect bot to game {self.game_id}")
 
         try:
-            # Run message handler and game loop concurrently
+            # Run message handler and game loop concurrently, with a single
+            # writer task draining the outbound queue
             self.running = True
+            self._writer_task = asyncio.create_task(self.write_messages())
             await asyncio.gather(
                 self.handle_messages(),
                 self.game_loop()
             )
         finally:
+            self.world.release(self)
+            if self._writer_task:
+                self._writer_task.cancel()
+                try:
+                    await self._writer_task
+                except asyncio.CancelledError:
+                    pass
+                self._writer_task = None
             if self.ws:
                 await self.ws.close()
@@ -0,0 +1,87 @@
+import bisect
+import hashlib
+import math
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with bounded loads.
+
+    Every replica is placed on the ring at several virtual points. A key
+    belongs to the first replica clockwise from the key's hash, so adding or
+    removing a replica only moves the keys next to its points. With loads
+    given, replicas that already carry more than load_factor times the
+    average load are skipped and the key goes to the next one on the ring.
+    """
+
+    def __init__(self, replicas: Iterable[str] = (), virtual_nodes: int = 64, load_factor: float = 1.25):
+        if load_factor < 1:
+            raise ValueError("Load factor must be at least 1")
+        self.virtual_nodes = virtual_nodes
+        self.load_factor = load_factor
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._replicas: List[str] = []
+        for replica in replicas:
+            self.add(replica)
+
+    @property
+    def replicas(self) -> List[str]:
+        return list(self._replicas)
+
+    def add(self, replica: str):
+        if replica in self._replicas:
+            return
+        self._replicas.append(replica)
+        for i in range(self.virtual_nodes):
+            point = _hash(f"{replica}#{i}")
+            # a collision leaves the point with the replica added first
+            if point not in self._owners:
+                self._owners[point] = replica
+                bisect.insort(self._points, point)
+
+    def remove(self, replica: str):
+        if replica not in self._replicas:
+            return
+        self._replicas.remove(replica)
+        self._points = [point for point in self._points if self._owners[point] != replica]
+        self._owners = {point: self._owners[point] for point in self._points}
+
+    def candidates(self, key: str) -> Iterator[str]:
+        """Yield each replica once, in ring order starting at the key"""
+        if not self._points:
+            return
+        start = bisect.bisect(self._points, _hash(key))
+        seen = set()
+        for i in range(len(self._points)):
+            replica = self._owners[self._points[(start + i) % len(self._points)]]
+            if replica not in seen:
+                seen.add(replica)
+                yield replica
+                if len(seen) == len(self._replicas):
+                    return
+
+    def capacity(self, total_load: int, replicas: Optional[int] = None) -> int:
+        """Most load a replica may carry once one more unit is placed"""
+        replicas = replicas or len(self._replicas)
+        return math.ceil(self.load_factor * (total_load + 1) / replicas)
+
+    def lookup(self, key: str, loads: Optional[Dict[str, int]] = None, exclude: Iterable[str] = ()) -> str:
+        """Return the replica for key, skipping excluded and full replicas"""
+        exclude = set(exclude)
+        candidates = [replica for replica in self.candidates(key) if replica not in exclude]
+        if not candidates:
+            raise ValueError("No replica available")
+        if not loads:
+            return candidates[0]
+
+        capacity = self.capacity(sum(loads.get(replica, 0) for replica in candidates), len(candidates))
+        for replica in candidates:
+            if loads.get(replica, 0) < capacity:
+                return replica
+        # unreachable while the load factor is at least 1, kept for safety
+        return min(candidates, key=lambda replica: loads.get(replica, 0))
@@ -0,0 +1,117 @@
+import logging
+import math
+from typing import Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency (the "fast" extra)
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(dx: float, dy: float) -> Tuple[float, float]:
+    """Normalize a direction vector, returning (0, 0) for a zero vector"""
+    length = math.sqrt(dx * dx + dy * dy)
+    if length == 0:
+        return 0, 0
+    return dx / length, dy / length
+
+
+class PythonFoodIndex:
+    """Food positions kept in plain lists, searched with a Python loop"""
+
+    def __init__(self):
+        self.xs: list = []
+        self.ys: list = []
+
+    def __len__(self):
+        return len(self.xs)
+
+    def reset(self, food: Sequence[dict]):
+        """Replace all positions with those of the given food items"""
+        self.xs = [f["circle"]["x"] for f in food]
+        self.ys = [f["circle"]["y"] for f in food]
+
+    def set(self, index: int, x: float, y: float):
+        """Update the position of a single food item"""
+        if index >= len(self.xs):
+            missing = index + 1 - len(self.xs)
+            self.xs.extend([math.inf] * missing)
+            self.ys.extend([math.inf] * missing)
+        self.xs[index] = x
+        self.ys[index] = y
+
+    def position(self, index: int) -> Tuple[float, float]:
+        return self.xs[index], self.ys[index]
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        """Index of the food closest to (x, y), the first one on ties"""
+        nearest = None
+        min_distance = math.inf
+        for i, (fx, fy) in enumerate(zip(self.xs, self.ys)):
+            dx = fx - x
+            dy = fy - y
+            distance = dx * dx + dy * dy
+            if distance < min_distance:
+                min_distance = distance
+                nearest = i
+        return nearest
+
+
+class NumpyFoodIndex:
+    """Food positions kept in NumPy arrays, searched with a vectorised argmin"""
+
+    def __init__(self):
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def reset(self, food: Sequence[dict]):
+        """Replace all positions with those of the given food items"""
+        self.xs = np.fromiter((f["circle"]["x"] for f in food), dtype=np.float64, count=len(food))
+        self.ys = np.fromiter((f["circle"]["y"] for f in food), dtype=np.float64, count=len(food))
+
+    def set(self, index: int, x: float, y: float):
+        """Update the position of a single food item"""
+        if index >= len(self.xs):
+            missing = index + 1 - len(self.xs)
+            self.xs = np.concatenate((self.xs, np.full(missing, np.inf)))
+            self.ys = np.concatenate((self.ys, np.full(missing, np.inf)))
+        self.xs[index] = x
+        self.ys[index] = y
+
+    def position(self, index: int) -> Tuple[float, float]:
+        return float(self.xs[index]), float(self.ys[index])
+
+    def nearest(self, x: float, y: float) -> Optional[int]:
+        """Index of the food closest to (x, y), the first one on ties"""
+        if not len(self.xs):
+            return None
+        dx = self.xs - x
+        dy = self.ys - y
+        distances = dx * dx + dy * dy
+        nearest = int(np.argmin(distances))
+        # match the Python loop, which never selects unreachable (inf) slots
+        if not distances[nearest] < math.inf:
+            return None
+        return nearest
+
+
+FOOD_INDEXES = {
+    "python": PythonFoodIndex,
+}
+if np is not None:
+    FOOD_INDEXES["numpy"] = NumpyFoodIndex
+
+
+def get_food_index_class(backend: str = "auto"):
+    """Select the food index implementation, preferring NumPy when available"""
+    if backend == "auto":
+        return FOOD_INDEXES.get("numpy", PythonFoodIndex)
+    if backend not in FOOD_INDEXES:
+        logger.warning(f"Kernel backend {backend} is not available, using python")
+        return PythonFoodIndex
+    return FOOD_INDEXES[backend]
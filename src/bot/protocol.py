@@ -0,0 +1,121 @@
+import json
+from typing import Optional, Union
+
+from src.proto import game_pb2
+
+# WebSocket subprotocols offered when connecting to the game server. A server
+# that does not pick one keeps talking JSON.
+JSON_SUBPROTOCOL = "rso-game.json"
+PROTOBUF_SUBPROTOCOL = "rso-game.protobuf"
+
+
+class JsonCodec:
+    """Encodes game messages as JSON text frames."""
+
+    name = "json"
+
+    def encode(self, message: dict) -> str:
+        return json.dumps(message)
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        return json.loads(frame)
+
+
+class ProtobufCodec:
+    """Encodes game messages as binary `game.GameMessage` frames.
+
+    Decoded messages have the same shape as their JSON counterparts so the
+    client state handling does not depend on the negotiated protocol.
+    """
+
+    name = "protobuf"
+
+    def encode(self, message: dict) -> bytes:
+        msg_type = message["type"]
+        data = message["data"]
+        envelope = game_pb2.GameMessage()
+        if msg_type == "move":
+            envelope.move.x = data["x"]
+            envelope.move.y = data["y"]
+        elif msg_type == "join":
+            envelope.join.player_name = data["playerName"]
+        elif msg_type == "gameState":
+            _fill_world(envelope.game_state, data)
+        elif msg_type == "update":
+            _fill_world(envelope.update, data)
+        elif msg_type == "spawn":
+            _fill_player(envelope.spawn, data)
+        else:
+            raise ValueError(f"Unknown message type {msg_type}")
+        return envelope.SerializeToString()
+
+    def decode(self, frame: Union[str, bytes]) -> dict:
+        if isinstance(frame, str):
+            # The server may still send text frames, e.g. for errors
+            return json.loads(frame)
+
+        envelope = game_pb2.GameMessage.FromString(frame)
+        payload = envelope.WhichOneof("payload")
+        if payload == "update":
+            return {"type": "update", "data": _world_to_dict(envelope.update)}
+        elif payload == "game_state":
+            return {"type": "gameState", "data": _world_to_dict(envelope.game_state)}
+        elif payload == "spawn":
+            return {"type": "spawn", "data": _player_to_dict(envelope.spawn)}
+        elif payload == "move":
+            return {"type": "move", "data": {"x": envelope.move.x, "y": envelope.move.y}}
+        elif payload == "join":
+            return {"type": "join", "data": {"playerName": envelope.join.player_name}}
+        raise ValueError("Received game message without payload")
+
+
+# Codecs are stateless, so every client shares these instances
+JSON_CODEC = JsonCodec()
+PROTOBUF_CODEC = ProtobufCodec()
+
+
+def codec_for_subprotocol(subprotocol: Optional[str]):
+    """Return the codec for the subprotocol the server selected."""
+    if subprotocol == PROTOBUF_SUBPROTOCOL:
+        return PROTOBUF_CODEC
+    return JSON_CODEC
+
+
+def _circle_to_dict(circle) -> dict:
+    return {"x": circle.x, "y": circle.y, "radius": circle.radius}
+
+
+def _player_to_dict(player) -> dict:
+    return {
+        "playerName": player.player_name,
+        "alive": player.alive,
+        "circle": _circle_to_dict(player.circle),
+    }
+
+
+def _world_to_dict(world) -> dict:
+    return {
+        "players": [_player_to_dict(p) for p in world.players],
+        "food": [{"index": f.index, "circle": _circle_to_dict(f.circle)} for f in world.food],
+    }
+
+
+def _fill_circle(circle, data: dict):
+    circle.x = data["x"]
+    circle.y = data["y"]
+    circle.radius = data.get("radius", 0)
+
+
+def _fill_player(player, data: dict):
+    player.player_name = data["playerName"]
+    player.alive = data.get("alive", False)
+    _fill_circle(player.circle, data["circle"])
+
+
+def _fill_world(world, data: dict):
+    for p in data.get("players", []):
+        _fill_player(world.players.add(), p)
+    for f in data.get("food", []):
+        food = world.food.add()
+        food.index = f["index"]
+        _fill_circle(food.circle, f["circle"])
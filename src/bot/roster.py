@@ -0,0 +1,87 @@
+import json
+import logging
+import os
+from typing import Dict, Iterable
+
+from google.protobuf import json_format
+
+from src.proto import bot_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class RosterJournal:
+    """Append-only journal of bot additions and removals.
+
+    Each line is a JSON record, either ``{"op": "add", "bot": <CreateBotRequest>}``
+    or ``{"op": "remove", "bot_id": ...}``. Replaying the journal yields the
+    roster at the time of the last write; compaction rewrites it with only the
+    live bots. Records contain access tokens, so the file is only readable by
+    its owner.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Records written since the last compaction
+        self.records = 0
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            self._file = os.fdopen(fd, "a", encoding="utf-8")
+        return self._file
+
+    def _append(self, record: dict):
+        file = self._open()
+        file.write(json.dumps(record) + "\n")
+        file.flush()
+        self.records += 1
+
+    def record_add(self, identity: bot_pb2.CreateBotRequest):
+        self._append({"op": "add", "bot": json_format.MessageToDict(identity, preserving_proto_field_name=True)})
+
+    def record_remove(self, bot_id: str):
+        self._append({"op": "remove", "bot_id": bot_id})
+
+    def load(self) -> Dict[str, bot_pb2.CreateBotRequest]:
+        """Replay the journal, returning the roster keyed by bot id"""
+        roster: Dict[str, bot_pb2.CreateBotRequest] = {}
+        if not os.path.exists(self.path):
+            return roster
+
+        with open(self.path, encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "add":
+                        identity = json_format.ParseDict(record["bot"], bot_pb2.CreateBotRequest())
+                        roster[identity.bot_id] = identity
+                    elif record["op"] == "remove":
+                        roster.pop(record["bot_id"], None)
+                except (ValueError, KeyError, json_format.ParseError) as e:
+                    # A crash can leave a partially written last line
+                    logger.warning(f"Skipping unreadable roster journal line {line_number}: {e}")
+        return roster
+
+    def compact(self, roster: Iterable[bot_pb2.CreateBotRequest]):
+        """Atomically replace the journal with one add record per live bot"""
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            for identity in roster:
+                record = {"op": "add", "bot": json_format.MessageToDict(identity, preserving_proto_field_name=True)}
+                file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        self.records = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import grpc
+from google.protobuf import field_mask_pb2
+
+from src.bot.hash_ring import HashRing
+from src.bot.service import encode_page_token
+from src.proto import bot_pb2
+from src.proto import bot_pb2_grpc
+from src.profiling import Profiler
+
+logger = logging.getLogger(__name__)
+
+# Per-call timeout when forwarding to a replica
+FORWARD_TIMEOUT = 15.0
+
+
+class RouterServicer(bot_pb2_grpc.BotServiceServicer):
+    """BotService front that places bots on replicas by game.
+
+    Games are placed on the replica set with a consistent hash ring and stay
+    there while they have bots, so the bots of a game share one pod's game
+    world. The load bound is checked on every CreateBot: once a game's
+    replica carries more than its share, further bots of the game go to the
+    next replica on the ring. Bots already running are never moved. Calls
+    for known bots go to the replica running them, calls for unknown bots
+    are tried on every replica. When a replica refuses new bots (draining
+    or down) its games move to the next replica on the ring, so draining a
+    replica to the router spreads its bots out by game.
+    """
+
+    # Routers hold no bots, so there is nothing to drain
+    draining = False
+
+    def __init__(self, settings, replicas: Optional[List[str]] = None):
+        self.ring = HashRing(
+            replicas if replicas is not None else settings.router_replicas,
+            virtual_nodes=settings.router_virtual_nodes,
+            load_factor=settings.router_load_factor,
+        )
+        self.profiler = Profiler(settings.profile_max_seconds)
+        self.max_page_size = settings.list_bots_max_page_size
+        # game_id -> replica new bots of the game are created on
+        self.games: Dict[str, str] = {}
+        # bot_id -> (game_id, replica running the bot)
+        self.bots: Dict[str, Tuple[str, str]] = {}
+        # bots per replica and per game
+        self.loads: Counter = Counter()
+        self._game_sizes: Counter = Counter()
+        self._channels: Dict[str, grpc.aio.Channel] = {}
+        self._stubs: Dict[str, bot_pb2_grpc.BotServiceStub] = {}
+
+    def stub(self, replica: str) -> bot_pb2_grpc.BotServiceStub:
+        if replica not in self._stubs:
+            self._channels[replica] = grpc.aio.insecure_channel(replica)
+            self._stubs[replica] = bot_pb2_grpc.BotServiceStub(self._channels[replica])
+        return self._stubs[replica]
+
+    async def close(self):
+        for channel in self._channels.values():
+            await channel.close()
+        self._channels.clear()
+        self._stubs.clear()
+
+    def record(self, bot_id: str, game_id: str, replica: str):
+        """Remember where a bot runs"""
+        self.forget(bot_id)
+        self.bots[bot_id] = (game_id, replica)
+        self.loads[replica] += 1
+        self._game_sizes[game_id] += 1
+        self.games.setdefault(game_id, replica)
+
+    def forget(self, bot_id: str):
+        """Forget a bot, and its game once the game has no bots left"""
+        if bot_id not in self.bots:
+            return
+        game_id, replica = self.bots.pop(bot_id)
+        self.loads[replica] -= 1
+        self._game_sizes[game_id] -= 1
+        if self._game_sizes[game_id] <= 0:
+            del self._game_sizes[game_id]
+            self.games.pop(game_id, None)
+
+    def _release(self, game_id: str):
+        """Drop the placement of a game whose first bot could not be created"""
+        if not self._game_sizes.get(game_id):
+            self.games.pop(game_id, None)
+
+    def place(self, game_id: str, exclude=()) -> str:
+        """Return the replica for the next bot of a game.
+
+        A game stays on its replica while that replica is within the load
+        bound, otherwise its further bots go to the next replica on the ring
+        that is.
+        """
+        replica = self.games.get(game_id)
+        if replica is not None and replica not in exclude:
+            candidates = [candidate for candidate in self.ring.replicas if candidate not in exclude]
+            capacity = self.ring.capacity(sum(self.loads[candidate] for candidate in candidates), len(candidates))
+            if self.loads[replica] < capacity:
+                return replica
+            logger.info(f"Replica {replica} is full, placing further bots of game {game_id} elsewhere")
+        replica = self.ring.lookup(game_id, self.loads, exclude)
+        self.games[game_id] = replica
+        return replica
+
+    async def sync(self, timeout: float = 5.0):
+        """Rebuild the placements from the bots running on the replicas.
+
+        Run at startup to recover from a router restart, and periodically to
+        forget bots that ended on their own. Replicas that cannot be reached
+        keep their known bots.
+        """
+        replicas = self.ring.replicas
+        results = await asyncio.gather(
+            *(self._list_all(replica, timeout) for replica in replicas),
+            return_exceptions=True,
+        )
+        known = self.bots
+        self.bots, self.games, self.loads, self._game_sizes = {}, {}, Counter(), Counter()
+        for replica, result in zip(replicas, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not list bots on {replica}: {result}")
+                running = {bot_id: game_id for bot_id, (game_id, owner) in known.items() if owner == replica}
+            else:
+                running = result
+            for bot_id, game_id in running.items():
+                if self.games.get(game_id, replica) != replica:
+                    logger.warning(f"Game {game_id} has bots on {self.games[game_id]} and {replica}")
+                self.record(bot_id, game_id, replica)
+        logger.info(f"Router knows {len(self.bots)} bots in {len(self.games)} games on {len(replicas)} replicas")
+
+    async def _list_all(self, replica: str, timeout: float) -> Dict[str, str]:
+        """Return bot_id -> game_id of every bot on a replica, page by page"""
+        request = bot_pb2.ListBotsRequest(field_mask=field_mask_pb2.FieldMask(paths=["bot_id", "bot"]))
+        running = {}
+        while True:
+            page = await self.stub(replica).ListBots(request, timeout=timeout)
+            running.update((status.bot_id, status.bot.game_id) for status in page.statuses)
+            if not page.next_page_token:
+                return running
+            request.page_token = page.next_page_token
+
+    async def sync_periodically(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.sync()
+
+    async def _fan_out(self, method: str, request) -> List[Tuple[str, object]]:
+        """Call a method on every replica, returning the responses and errors"""
+        replicas = self.ring.replicas
+        results = await asyncio.gather(
+            *(getattr(self.stub(replica), method)(request, timeout=FORWARD_TIMEOUT) for replica in replicas),
+            return_exceptions=True,
+        )
+        return list(zip(replicas, results))
+
+    async def CreateBot(self, request, context):
+        game_id = request.bot.game_id
+        refused = []
+        while True:
+            try:
+                replica = self.place(game_id, exclude=refused)
+            except ValueError:
+                self._release(game_id)
+                context.set_code(grpc.StatusCode.UNAVAILABLE)
+                context.set_details(f"No replica accepts bots for game {game_id}")
+                return bot_pb2.CreateBotResponse()
+            try:
+                response = await self.stub(replica).CreateBot(request, timeout=FORWARD_TIMEOUT)
+            except grpc.aio.AioRpcError as e:
+                if e.code() == grpc.StatusCode.UNAVAILABLE:
+                    # draining or down, move the game on to the next replica
+                    logger.warning(f"Replica {replica} refused bot {request.bot_id}: {e.details()}")
+                    refused.append(replica)
+                    continue
+                self._release(game_id)
+                context.set_code(e.code())
+                context.set_details(e.details())
+                return bot_pb2.CreateBotResponse()
+            self.record(request.bot_id, game_id, replica)
+            logger.info(f"Routed bot {request.bot_id} of game {game_id} to {replica}")
+            return response
+
+    async def DeleteBot(self, request, context):
+        if request.bot_id in self.bots:
+            replicas = [self.bots[request.bot_id][1]]
+        else:
+            replicas = self.ring.replicas
+        for replica in replicas:
+            try:
+                await self.stub(replica).DeleteBot(request, timeout=FORWARD_TIMEOUT)
+            except grpc.aio.AioRpcError as e:
+                if e.code() == grpc.StatusCode.NOT_FOUND:
+                    continue
+                context.set_code(e.code())
+                context.set_details(e.details())
+                return bot_pb2.Empty()
+            self.forget(request.bot_id)
+            return bot_pb2.Empty()
+        self.forget(request.bot_id)
+        context.set_code(grpc.StatusCode.NOT_FOUND)
+        context.set_details(f"Bot {request.bot_id} does not exist")
+        return bot_pb2.Empty()
+
+    async def GetBot(self, request, context):
+        if request.bot_id in self.bots:
+            replicas = [self.bots[request.bot_id][1]]
+        else:
+            replicas = self.ring.replicas
+        for replica in replicas:
+            try:
+                return await self.stub(replica).GetBot(request, timeout=FORWARD_TIMEOUT)
+            except grpc.aio.AioRpcError as e:
+                if e.code() != grpc.StatusCode.NOT_FOUND:
+                    logger.warning(f"Could not get bot {request.bot_id} from {replica}: {e.details()}")
+        context.set_code(grpc.StatusCode.NOT_FOUND)
+        context.set_details(f"Bot {request.bot_id} not found")
+        return bot_pb2.Bot()
+
+    async def ListBots(self, request, context):
+        # Each replica returns its next page in bot id order, so the merged
+        # page ends where the first replica with more bots stopped
+        forwarded = bot_pb2.ListBotsRequest()
+        forwarded.CopyFrom(request)
+        page_size = min(request.page_size or self.max_page_size, self.max_page_size)
+        forwarded.page_size = page_size
+        strip_bot_id = bool(request.field_mask.paths) and "bot_id" not in request.field_mask.paths
+        if strip_bot_id:
+            forwarded.field_mask.paths.append("bot_id")
+
+        statuses, bots, last = [], {}, None
+        for replica, result in await self._fan_out("ListBots", forwarded):
+            if isinstance(result, grpc.aio.AioRpcError) and result.code() == grpc.StatusCode.INVALID_ARGUMENT:
+                context.set_code(result.code())
+                context.set_details(result.details())
+                return bot_pb2.ListBotsResponse()
+            if isinstance(result, Exception):
+                logger.warning(f"Could not list bots on {replica}: {result}")
+                continue
+            statuses.extend(result.statuses)
+            bots.update(result.bots)
+            if result.next_page_token and result.statuses:
+                last = min(last or result.statuses[-1].bot_id, result.statuses[-1].bot_id)
+
+        statuses.sort(key=lambda status: status.bot_id)
+        page = [status for status in statuses if last is None or status.bot_id <= last]
+        page = page[:page_size]
+        response = bot_pb2.ListBotsResponse()
+        if len(page) < len(statuses) or last is not None:
+            response.next_page_token = encode_page_token(page[-1].bot_id)
+        for status in page:
+            if status.bot_id in bots:
+                response.bots[status.bot_id].CopyFrom(bots[status.bot_id])
+            if strip_bot_id:
+                status.ClearField("bot_id")
+        response.statuses.extend(page)
+        return response
+
+    async def GetBotStats(self, request, context):
+        response = bot_pb2.GetBotStatsResponse()
+        games: Dict[str, bot_pb2.GameStats] = {}
+        bots = []
+        for replica, result in await self._fan_out("GetBotStats", request):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not get bot stats from {replica}: {result}")
+                continue
+            bots.extend(result.bots)
+            for game in result.games:
+                merged = games.get(game.game_id)
+                if merged is None:
+                    merged = games[game.game_id] = response.games.add(game_id=game.game_id)
+                merged.bots += game.bots
+                merged.total_seconds += game.total_seconds
+
+        bots.sort(key=lambda bot: bot.total_seconds, reverse=True)
+        response.bots.extend(bots[:request.top_n] if request.top_n > 0 else bots)
+        response.games.sort(key=lambda game: game.total_seconds, reverse=True)
+        return response
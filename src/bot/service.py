@@ -1,27 +1,75 @@
 import asyncio
+import base64
+import binascii
+import bisect
 import logging
-from concurrent import futures
-from typing import Dict
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set
 import grpc
-import uuid
 
-from src.bot.game_client import GameClient
+from src.bot.game_client import GameClient, RespawnState
+from src.bot.roster import RosterJournal
 from src.proto import bot_pb2
 from src.proto import bot_pb2_grpc
-from src.config.settings import Settings
+from src.config.settings import get_settings
+from src.profiling import Profiler, ProfilerBusyError
 
-settings = Settings()
+PROFILE_FORMATS = {"cpu": "collapsed", "memory": "tracemalloc"}
 
-logging.basicConfig(level=settings.log_level, format='{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}')
+# BotStatus fields a ListBots field mask may select
+STATUS_FIELDS = frozenset(bot_pb2.BotStatus.DESCRIPTOR.fields_by_name)
+# Without a field mask the configs are only sent in the legacy bots map
+DEFAULT_STATUS_FIELDS = STATUS_FIELDS - {"bot"}
+
+RESPAWN_STATES = {
+    RespawnState.DEAD: bot_pb2.BOT_STATE_DEAD,
+    RespawnState.JOIN_PENDING: bot_pb2.BOT_STATE_JOINING,
+    RespawnState.ALIVE: bot_pb2.BOT_STATE_ALIVE,
+}
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
+
+def encode_page_token(bot_id: str) -> str:
+    """ListBots page token continuing after bot_id"""
+    return base64.urlsafe_b64encode(bot_id.encode()).decode()
+
+
+def decode_page_token(page_token: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(page_token.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid page token")
+
+
+def bot_state(client) -> int:
+    """BotState of a bot's game client"""
+    if not client.connected:
+        return bot_pb2.BOT_STATE_CONNECTING
+    return RESPAWN_STATES[client.respawn_state]
+
 class BotManager:
     def __init__(self, settings):
         self._bots: Dict[str, bot_pb2.Bot] = {}
         self._game_clients: Dict[str, GameClient] = {}
         self._tasks: Dict[str, asyncio.Task] = {}
+        # Everything needed to recreate a bot elsewhere, including its access token
+        self._identities: Dict[str, bot_pb2.CreateBotRequest] = {}
+        # Bot ids in order, overall and per game, so that ListBots pages
+        # without sorting the fleet on every call
+        self._bot_ids: List[str] = []
+        self._game_bot_ids: Dict[str, List[str]] = {}
+        # Set while handing bots off to another pod, new bots are refused
+        self.draining = False
+        self._drain_lock = asyncio.Lock()
+        # handoffs in flight, finished even when the drain is cancelled
+        self._handoffs: Set[asyncio.Task] = set()
         self.settings = settings
+        # Optional on-disk roster, replayed by restore() after a restart
+        self.journal = RosterJournal(settings.roster_journal_path) if settings.roster_journal_path else None
+        self.restore_seconds: Optional[float] = None
     
     async def add_bot(self, bot_id: str, bot: bot_pb2.Bot, access_token: str, host_name: str="localhost") -> None:
         logger.info(f"Adding bot {bot_id} to game {bot.game_id}")
@@ -40,7 +88,8 @@ class BotManager:
             strategy=bot.strategy if bot.strategy else "greedy",
             host_name=host_name, # TODO get from protobuf
             game_port=self.settings.game_port or "8080",
-            access_token=access_token
+            access_token=access_token,
+            difficulty=bot.difficulty,
         )
         
         # # Try to connect first
@@ -53,6 +102,13 @@ class BotManager:
         # Only add the bot if connection was successful
         self._bots[bot_id] = bot
         self._game_clients[bot_id] = client
+        bisect.insort(self._bot_ids, bot_id)
+        bisect.insort(self._game_bot_ids.setdefault(bot.game_id, []), bot_id)
+        self._identities[bot_id] = bot_pb2.CreateBotRequest(
+            bot_id=bot_id, bot=bot, access_token=access_token, hostname=host_name
+        )
+        if self.journal:
+            self.journal.record_add(self._identities[bot_id])
         logger.info(f"Added bot {bot_id} to game {bot.game_id}")
 
     async def _run_bot(self, bot_id: str, client: GameClient):
@@ -60,52 +116,290 @@ class BotManager:
         try:
             await client.run()
         except asyncio.CancelledError:
+            # The bot was removed, or the service is shutting down and the bot
+            # must stay in the roster journal
             raise
         except Exception as e:
             logger.error(f"Bot {bot_id} encountered an error: {e}")
-        finally:
-            # If we get here, it means the connection dropped or there was an error
-            # Clean up the bot if it's not already removed
-            if bot_id in self._bots:
-                logger.info(f"Bot {bot_id} connection lost, cleaning up")
-                await self.remove_bot(bot_id)
+        # If we get here, it means the connection dropped or there was an error
+        # Clean up the bot if it's not already removed
+        if bot_id in self._bots:
+            logger.info(f"Bot {bot_id} connection lost, cleaning up")
+            await self.remove_bot(bot_id)
 
     async def remove_bot(self, bot_id: str) -> None:
         logger.info(f"Removing bot {bot_id}")
         if bot_id not in self._bots:
             raise ValueError(f"Bot {bot_id} does not exist")
-        
-        if bot_id in self._tasks:
-            self._tasks[bot_id].cancel()
+
+        # Forget the bot first so that _run_bot does not try to remove it again
+        bot = self._bots.pop(bot_id)
+        self._bot_ids.pop(bisect.bisect_left(self._bot_ids, bot_id))
+        game_bot_ids = self._game_bot_ids[bot.game_id]
+        game_bot_ids.pop(bisect.bisect_left(game_bot_ids, bot_id))
+        if not game_bot_ids:
+            del self._game_bot_ids[bot.game_id]
+        self._identities.pop(bot_id, None)
+        if self.journal:
+            self.journal.record_remove(bot_id)
+
+        task = self._tasks.pop(bot_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
             try:
-                await self._tasks[bot_id]
+                await task
             except asyncio.CancelledError:
                 pass
-            del self._tasks[bot_id]
-        
-        if bot_id in self._game_clients:
-            client = self._game_clients[bot_id]
-            if client.ws:
-                await client.ws.close()
-            del self._game_clients[bot_id]
         
-        if bot_id in self._bots:
-            del self._bots[bot_id]
+        client = self._game_clients.pop(bot_id, None)
+        if client and client.ws:
+            await client.ws.close()
             
         logger.info(f"Removed bot {bot_id}")
 
+    async def restore(self, stagger: float, timeout: float = 60.0) -> int:
+        """Restart the bots recorded in the roster journal, returning how many were restored"""
+        roster = self.journal.load()
+        self.journal.compact(roster.values())
+        if not roster:
+            return 0
+
+        logger.info(f"Restoring {len(roster)} bots from {self.journal.path}")
+        started = time.monotonic()
+        for i, identity in enumerate(roster.values()):
+            if i:
+                # spread reconnects out instead of hitting the game servers at once
+                await asyncio.sleep(stagger)
+            if identity.bot_id in self._bots:
+                continue
+            try:
+                await self.add_bot(identity.bot_id, identity.bot, identity.access_token, identity.hostname)
+            except Exception as e:
+                logger.error(f"Failed to restore bot {identity.bot_id}: {e}")
+
+        # Bots that fail to connect remove themselves from the roster
+        while time.monotonic() - started < timeout:
+            pending = [
+                bot_id for bot_id in roster
+                if bot_id in self._game_clients and not self._game_clients[bot_id].connected
+            ]
+            if not pending:
+                break
+            await asyncio.sleep(0.05)
+        self.restore_seconds = time.monotonic() - started
+        restored = sum(1 for bot_id in roster if bot_id in self._bots)
+        logger.info(f"Restored {restored}/{len(roster)} bots in {self.restore_seconds:.2f}s")
+        return restored
+
+    async def compact_roster_periodically(self, interval: float):
+        """Rewrite the roster journal with only the live bots whenever it has changed"""
+        while True:
+            await asyncio.sleep(interval)
+            if self.journal.records:
+                self.journal.compact(list(self._identities.values()))
+
+    async def handoff_bot(self, bot_id: str, stub: bot_pb2_grpc.BotServiceStub) -> Optional[bool]:
+        """Move a bot to the service behind stub, restarting it here if that fails.
+
+        Returns None if the bot is gone already. The handoff is shielded, so a
+        cancelled caller does not leave the bot stopped here and unknown to
+        the target.
+        """
+        identity = self._identities.get(bot_id)
+        if identity is None:
+            return None
+        task = asyncio.create_task(self._hand_off(identity, stub))
+        self._handoffs.add(task)
+        task.add_done_callback(self._handoffs.discard)
+        return await asyncio.shield(task)
+
+    async def _hand_off(self, identity: bot_pb2.CreateBotRequest, stub: bot_pb2_grpc.BotServiceStub) -> bool:
+        bot_id = identity.bot_id
+        # The game server identifies players by name, so the local connection
+        # is closed before the target connects with the same identity
+        await self.remove_bot(bot_id)
+        try:
+            await stub.CreateBot(identity, timeout=10)
+            logger.info(f"Handed off bot {bot_id} to another pod")
+            return True
+        except grpc.aio.AioRpcError as e:
+            logger.error(f"Failed to hand off bot {bot_id}: {e.details()}")
+            await self.add_bot(identity.bot_id, identity.bot, identity.access_token, identity.hostname)
+            return False
+
+    async def drain(self, target: str, batch_size: int, batch_interval: float) -> AsyncIterator[bot_pb2.DrainBotsProgress]:
+        """Stop admitting bots and hand off all bots to target in batches, yielding progress.
+
+        Raises ValueError if a drain is already running and ConnectionError if
+        the target does not accept connections. The pod only stays draining
+        once the drain has run to completion.
+        """
+        if self._drain_lock.locked():
+            raise ValueError("A drain is already running")
+        async with self._drain_lock, grpc.aio.insecure_channel(target) as channel:
+            try:
+                await asyncio.wait_for(channel.channel_ready(), self.settings.drain_connect_timeout)
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"Drain target {target} is not reachable")
+
+            self.draining = True
+            completed = False
+            try:
+                async for progress in self._hand_off_all(target, channel, batch_size, batch_interval):
+                    completed = progress.done
+                    yield progress
+            finally:
+                if self._handoffs:
+                    # finish handoffs of a cancelled drain while the channel is open
+                    await asyncio.gather(*self._handoffs, return_exceptions=True)
+                if not completed:
+                    # aborted, failed or cancelled, keep serving the remaining bots
+                    self.draining = False
+
+    async def _hand_off_all(self, target, channel, batch_size, batch_interval):
+        bot_ids = list(self._bots)
+        migrated = 0
+        failed_bot_ids = []
+        error = ""
+        logger.info(f"Draining {len(bot_ids)} bots to {target} in batches of {batch_size}")
+
+        stub = bot_pb2_grpc.BotServiceStub(channel)
+        for start in range(0, len(bot_ids), batch_size):
+            if start:
+                await asyncio.sleep(batch_interval)
+            # bots may have been removed since the drain started
+            batch = [bot_id for bot_id in bot_ids[start:start + batch_size] if bot_id in self._bots]
+            results = await asyncio.gather(*(self.handoff_bot(bot_id, stub) for bot_id in batch))
+            # bots that ended while their batch started are skipped
+            handed = [(bot_id, ok) for bot_id, ok in zip(batch, results) if ok is not None]
+            migrated += sum(ok for _, ok in handed)
+            failed_bot_ids.extend(bot_id for bot_id, ok in handed if not ok)
+            remaining = max(0, len(bot_ids) - start - batch_size)
+            if handed and not any(ok for _, ok in handed):
+                # the target refuses every bot, stop before moving the rest
+                error = f"Every handoff of a batch to {target} failed"
+                break
+            yield bot_pb2.DrainBotsProgress(
+                total=len(bot_ids),
+                migrated=migrated,
+                failed=len(failed_bot_ids),
+                remaining=remaining,
+                failed_bot_ids=failed_bot_ids,
+            )
+
+        if error:
+            logger.error(f"Drain stopped: {error}, {migrated} migrated, {len(failed_bot_ids)} failed")
+            yield bot_pb2.DrainBotsProgress(
+                total=len(bot_ids),
+                migrated=migrated,
+                failed=len(failed_bot_ids),
+                remaining=remaining,
+                failed_bot_ids=failed_bot_ids,
+                error=error,
+            )
+            return
+        logger.info(f"Drain finished: {migrated} migrated, {len(failed_bot_ids)} failed")
+        yield bot_pb2.DrainBotsProgress(
+            total=len(bot_ids),
+            migrated=migrated,
+            failed=len(failed_bot_ids),
+            done=True,
+            failed_bot_ids=failed_bot_ids,
+        )
+
+    def list_bots(self, request: bot_pb2.ListBotsRequest) -> bot_pb2.ListBotsResponse:
+        """Return a page of bots with their runtime status, filtered by game and state"""
+        fields = set(request.field_mask.paths) or DEFAULT_STATUS_FIELDS
+        unknown = fields - STATUS_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown BotStatus fields: {', '.join(sorted(unknown))}")
+        if request.page_size < 0:
+            raise ValueError("Page size must not be negative")
+        max_page_size = self.settings.list_bots_max_page_size
+        page_size = min(request.page_size, max_page_size) if request.page_size else max_page_size
+
+        bot_ids = self._game_bot_ids.get(request.game_id, []) if request.game_id else self._bot_ids
+        start = bisect.bisect_right(bot_ids, decode_page_token(request.page_token)) if request.page_token else 0
+
+        response = bot_pb2.ListBotsResponse()
+        now = time.monotonic()
+        for index in range(start, len(bot_ids)):
+            if len(response.statuses) == page_size:
+                response.next_page_token = encode_page_token(bot_ids[index - 1])
+                break
+            bot_id = bot_ids[index]
+            client = self._game_clients[bot_id]
+            state = bot_state(client)
+            if request.state and state != request.state:
+                continue
+
+            bot = self._bots[bot_id]
+            values = {
+                "bot_id": bot_id,
+                "bot": bot,
+                "state": state,
+                "connected": client.connected,
+                "alive": client.alive,
+                "last_message_age_seconds": now - client.last_message_at if client.last_message_at else -1.0,
+                "moves_sent": client.moves_sent,
+            }
+            response.statuses.add(**{field: values[field] for field in fields})
+            if not request.field_mask.paths:
+                response.bots[bot_id].CopyFrom(bot)
+        return response
+
+    def get_bot_stats(self, top_n: int = 0) -> bot_pb2.GetBotStatsResponse:
+        """Return the bots that spent the most CPU time, and per-game totals"""
+        clients = sorted(self._game_clients.items(), key=lambda item: item[1].cpu_seconds, reverse=True)
+        response = bot_pb2.GetBotStatsResponse()
+        games: Dict[str, bot_pb2.GameStats] = {}
+        for bot_id, client in clients:
+            game = games.get(client.game_id)
+            if game is None:
+                game = games[client.game_id] = response.games.add(game_id=client.game_id)
+            game.bots += 1
+            game.total_seconds += client.cpu_seconds
+
+        for bot_id, client in clients[:top_n] if top_n > 0 else clients:
+            response.bots.add(
+                bot_id=bot_id,
+                game_id=client.game_id,
+                decode_seconds=client.decode_seconds,
+                update_seconds=client.update_seconds,
+                move_seconds=client.move_seconds,
+                total_seconds=client.cpu_seconds,
+                max_tick_seconds=client.max_tick_seconds,
+                messages_received=client.messages_received,
+                moves_calculated=client.moves_calculated,
+                queue_depth=client.queue_depth,
+                dropped_moves=client.dropped_moves,
+                respawns=client.respawns,
+                average_respawn_latency_seconds=client.average_respawn_latency or 0.0,
+            )
+        response.games.sort(key=lambda game: game.total_seconds, reverse=True)
+        return response
+
 class BotServiceServicer(bot_pb2_grpc.BotServiceServicer):
-    def __init__(self):
+    """gRPC servicer running on the same asyncio loop as the bots"""
+
+    def __init__(self, settings=settings):
         self.bot_manager = BotManager(settings)
-        self.loop = None
+        self.profiler = Profiler(settings.profile_max_seconds)
+
+    @property
+    def draining(self) -> bool:
+        return self.bot_manager.draining
 
-    def CreateBot(self, request, context):
+    async def CreateBot(self, request, context):
+        if self.bot_manager.draining:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details("Bot service is draining")
+            return bot_pb2.CreateBotResponse()
         try:
-            future = asyncio.run_coroutine_threadsafe(
+            await asyncio.wait_for(
                 self.bot_manager.add_bot(request.bot_id, request.bot, request.access_token, request.hostname),
-                self.loop
+                timeout=10
             )
-            future.result(timeout=10)  # 10 second timeout
             return bot_pb2.CreateBotResponse(
                 bot_id=request.bot_id,
                 status="created"
@@ -127,13 +421,9 @@ class BotServiceServicer(bot_pb2_grpc.BotServiceServicer):
             context.set_details(str(e))
             return bot_pb2.CreateBotResponse()
 
-    def DeleteBot(self, request, context):
+    async def DeleteBot(self, request, context):
         try:
-            future = asyncio.run_coroutine_threadsafe(
-                self.bot_manager.remove_bot(request.bot_id),
-                self.loop
-            )
-            future.result(timeout=10)
+            await asyncio.wait_for(self.bot_manager.remove_bot(request.bot_id), timeout=10)
             return bot_pb2.Empty()
         except ValueError as e:
             context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -145,7 +435,7 @@ class BotServiceServicer(bot_pb2_grpc.BotServiceServicer):
             context.set_details(str(e))
             return bot_pb2.Empty()
 
-    def GetBot(self, request, context):
+    async def GetBot(self, request, context):
         bot_id = request.bot_id
         if bot_id not in self.bot_manager._bots:
             context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -153,5 +443,48 @@ class BotServiceServicer(bot_pb2_grpc.BotServiceServicer):
             return bot_pb2.Bot()
         return self.bot_manager._bots[bot_id]
 
-    def ListBots(self, request, context):
-        return bot_pb2.ListBotsResponse(bots=self.bot_manager._bots)
+    async def ListBots(self, request, context):
+        try:
+            return self.bot_manager.list_bots(request)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return bot_pb2.ListBotsResponse()
+
+    async def GetBotStats(self, request, context):
+        return self.bot_manager.get_bot_stats(request.top_n)
+
+    async def DrainBots(self, request, context):
+        batch_size = request.batch_size or self.bot_manager.settings.drain_batch_size
+        batch_interval = request.batch_interval_seconds or self.bot_manager.settings.drain_batch_interval
+        if not request.target:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Drain target is required")
+            return
+        try:
+            async for progress in self.bot_manager.drain(request.target, batch_size, batch_interval):
+                yield progress
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            context.set_details(str(e))
+        except ConnectionError as e:
+            context.set_code(grpc.StatusCode.UNAVAILABLE)
+            context.set_details(str(e))
+
+    async def Profile(self, request, context):
+        try:
+            data = await self.profiler.capture(
+                request.mode or "cpu",
+                request.duration_seconds,
+                interval=request.interval_seconds or 0.005,
+                limit=request.limit or 25,
+            )
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return bot_pb2.ProfileResponse()
+        except ProfilerBusyError as e:
+            context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+            context.set_details(str(e))
+            return bot_pb2.ProfileResponse()
+        return bot_pb2.ProfileResponse(format=PROFILE_FORMATS[request.mode or "cpu"], data=data)
@@ -1,9 +1,12 @@
 import math
 from typing import Tuple
 
+from .kernels import get_food_index_class, normalize
+
 class BotStrategy:
-    def __init__(self):
-        pass
+    def __init__(self, kernel_backend: str = "auto"):
+        # kernel for food indexes that callers keep up to date and pass to find_nearest_food
+        self.food_index_class = get_food_index_class(kernel_backend)
         
     def calculate_move(self, game_state, bot_name) -> Tuple[float, float]:
         """Calculate next move based on game state"""
@@ -34,22 +37,28 @@ class BotStrategy:
             
         return 0, 0
         
-    def find_nearest_food(self, position, food_list):
-        """Find the nearest food item"""
+    def find_nearest_food(self, position, food_list, food_index=None):
+        """Find the nearest food item, using food_index if the caller maintains one"""
         if not food_list:
             return None
-            
+
+        x, y = position["x"], position["y"]
+        if food_index is not None:
+            nearest = food_index.nearest(x, y)
+            return None if nearest is None else food_list[nearest]
+
+        # building a throwaway index, with either kernel, costs more than searching the list
         nearest = None
-        min_distance = float('inf')
-        
+        min_distance = math.inf
         for food in food_list:
-            dist = self.calculate_distance(position, food["circle"])
-            if dist < min_distance:
-                min_distance = dist
+            dx = food["circle"]["x"] - x
+            dy = food["circle"]["y"] - y
+            distance = dx * dx + dy * dy
+            if distance < min_distance:
+                min_distance = distance
                 nearest = food
-                
         return nearest
-        
+
     def calculate_distance(self, pos1, pos2):
         """Calculate distance between two positions"""
         dx = pos1["x"] - pos2["x"]
@@ -58,12 +67,4 @@ class BotStrategy:
         
     def calculate_direction(self, from_pos, to_pos):
         """Calculate direction vector to target"""
-        dx = to_pos["x"] - from_pos["x"]
-        dy = to_pos["y"] - from_pos["y"]
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        if length == 0:
-            return 0, 0
-            
-        # Normalize the vector
-        return dx/length, dy/length
\ No newline at end of file
+        return normalize(to_pos["x"] - from_pos["x"], to_pos["y"] - from_pos["y"])
@@ -0,0 +1,135 @@
+import sys
+import weakref
+from typing import Optional, Tuple
+
+from .kernels import get_food_index_class
+from src.config.settings import get_settings
+
+# Nearest-food search kernel, NumPy when available unless configured otherwise
+FoodIndex = get_food_index_class(get_settings().kernel_backend)
+
+# Worlds by (host, port, game_id), kept alive only by the clients using them
+_worlds: "weakref.WeakValueDictionary[Tuple[str, int, str], GameWorld]" = weakref.WeakValueDictionary()
+
+
+class GameWorld:
+    """Game state of one game, shared by every bot of this process in that game.
+
+    All bots in a game receive the same frames, so instead of each bot keeping
+    its own copy of the food and players one of them, the feeder, applies its
+    frames to a shared world and the others only read it. The frames of one
+    connection arrive in order, so the world follows a single consistent
+    stream. Frames carry no sequence numbers, so a bot cannot continue another
+    bot's stream: the feeder and its successor, the standby, both start from a
+    game state of their own. The standby applies its frames to a private world
+    that replaces the shared one when the feeder leaves, so no update is lost
+    in the handover. Without a standby the world waits for the next bot to
+    receive a game state.
+    """
+
+    __slots__ = ("game_id", "state", "food_index", "_feeder", "_standby", "_standby_world", "__weakref__")
+
+    def __init__(self, game_id: str):
+        self.game_id = sys.intern(game_id)
+        self.state = {"food": [], "players": {}}
+        self.food_index = FoodIndex()
+        # weak reference to the GameClient whose frames are applied to the world,
+        # so a client dropped without closing does not keep feeding it
+        self._feeder: Optional[weakref.ref] = None
+        # the next feeder and the world it keeps up to date until it takes over
+        self._standby: Optional[weakref.ref] = None
+        self._standby_world: Optional[GameWorld] = None
+
+    @classmethod
+    def for_game(cls, host_name: str, game_port: int, game_id: str) -> "GameWorld":
+        """Return the shared world of a game, creating it if no bot uses it yet"""
+        key = (host_name, game_port, game_id)
+        world = _worlds.get(key)
+        if world is None:
+            world = _worlds[key] = cls(game_id)
+        return world
+
+    @property
+    def food(self) -> list:
+        return self.state["food"]
+
+    @property
+    def players(self) -> dict:
+        return self.state["players"]
+
+    @property
+    def feeder(self):
+        return self._feeder() if self._feeder is not None else None
+
+    @property
+    def standby(self):
+        return self._standby() if self._standby is not None else None
+
+    def source(self, client, game_state: bool) -> Optional["GameWorld"]:
+        """Return the world the frames of client are applied to, None if another bot applies them.
+
+        The feeder applies its frames to this world and the standby to its
+        private one. A client becomes the feeder or the standby when the
+        role is free and its frame is a game state, which it can continue
+        from.
+        """
+        feeder = self.feeder
+        if feeder is None and self.standby is not None:
+            # the feeder was dropped without releasing the world
+            self._take_over()
+            feeder = self.feeder
+        if feeder is client:
+            return self
+        if feeder is None and game_state:
+            self._feeder = weakref.ref(client)
+            return self
+        standby = self.standby
+        if standby is client:
+            return self._standby_world
+        if standby is None and game_state:
+            self._standby = weakref.ref(client)
+            self._standby_world = GameWorld(self.game_id)
+            return self._standby_world
+        return None
+
+    def release(self, client):
+        """Stop taking frames from client, e.g. when its connection closes"""
+        if self.feeder is client:
+            self._take_over()
+        elif self.standby is client:
+            self._standby = self._standby_world = None
+
+    def _take_over(self):
+        """Replace the feeder by the standby and its world, if there is one"""
+        if self.standby is None:
+            self._feeder = None
+        else:
+            self._feeder = self._standby
+            self.state = self._standby_world.state
+            self.food_index = self._standby_world.food_index
+        self._standby = self._standby_world = None
+
+    def reset(self, data: dict):
+        """Replace the world with a full game state"""
+        # copied, updates replace its items and the message may be shared
+        self.state["food"] = list(data.get("food", []))
+        self.state["players"] = {p["playerName"]: p for p in data.get("players", [])}
+        self.food_index.reset(self.state["food"])
+
+    def update(self, data: dict):
+        """Apply changed players and food"""
+        players = self.state["players"]
+        for player in data.get("players", []):
+            players[player["playerName"]] = player
+
+        food = self.state["food"]
+        for f in data.get("food", []):
+            food[f["index"]] = f
+            self.food_index.set(f["index"], f["circle"]["x"], f["circle"]["y"])
+
+    def spawn(self, player: dict):
+        """Add a new player or update an existing one"""
+        self.state["players"][player["playerName"]] = player
+
+    def player(self, player_name: str) -> Optional[dict]:
+        return self.state["players"].get(player_name)
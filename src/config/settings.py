@@ -1,5 +1,8 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     """Application settings"""
@@ -9,5 +12,58 @@ class Settings(BaseSettings):
     log_level: str = Field("INFO", description="Logging level")
     
     grpc_port: int = Field(50051, description="gRPC server port")
+    http_port: int = Field(8080, description="Health and metrics HTTP server port")
+
+    # Event loop backend, "auto" (uvloop when installed), "uvloop" or "asyncio"
+    loop_backend: str = Field("auto", description="asyncio event loop implementation")
+
+    # Respawn settings
+    respawn_delay: float = Field(0.0, description="Seconds to wait after death before sending a join")
+    respawn_timeout: float = Field(2.0, description="Seconds to wait for a join to take effect before retrying")
+
+    # Outbound queue settings
+    send_queue_size: int = Field(4, ge=1, description="Maximum number of queued move messages per bot")
+
+    # Game wire protocol, "json" or "protobuf" (negotiated, falls back to JSON)
+    game_protocol: str = Field("json", description="Preferred game wire protocol")
+
+    # Nearest-food search kernel, "auto" (NumPy when installed), "numpy" or "python"
+    kernel_backend: str = Field("auto", description="Strategy kernel backend")
+
+    # Slow tick logging, 0 disables it
+    slow_tick_threshold_ms: float = Field(50.0, description="Log bot ticks slower than this many milliseconds")
+
+    # Drain settings, used when DrainBots does not specify them
+    drain_batch_size: int = Field(10, description="Bots handed off to the target pod per batch")
+    drain_batch_interval: float = Field(1.0, description="Seconds between drain batches")
+    drain_connect_timeout: float = Field(5.0, description="Seconds to wait for the drain target to accept connections")
+
+    # Roster journal, disabled unless a path is set
+    roster_journal_path: Optional[str] = Field(None, description="Append-only journal of the bot roster")
+    roster_compact_interval: float = Field(60.0, description="Seconds between roster journal compactions")
+    roster_restore_stagger: float = Field(0.05, description="Seconds between bot reconnects when restoring the roster")
+
+    # Upper bound for on-demand profiles
+    profile_max_seconds: float = Field(30.0, description="Maximum duration of a /debug/profile capture")
+
+    # Bots decide on every n-th server update, by difficulty (default 1)
+    decision_every: Dict[str, int] = Field(
+        {"easy": 3, "medium": 2, "hard": 1}, description="Server updates per decision for each difficulty"
+    )
+
+    # Upper bound for ListBots page_size, also the page size of requests without one
+    list_bots_max_page_size: int = Field(1000, description="Maximum number of bots in a ListBots page")
+
+    # Router mode, enabled by listing the bot service replicas ("host:port")
+    router_replicas: List[str] = Field([], description="Bot service replicas to route bots to by game")
+    router_virtual_nodes: int = Field(64, description="Points per replica on the consistent hash ring")
+    router_load_factor: float = Field(1.25, description="Most bots a replica takes relative to the average before new bots spill over")
+    router_sync_interval: float = Field(30.0, description="Seconds between refreshes of the bots running on the replicas")
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings, loading them on first use"""
+    return Settings()
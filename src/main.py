@@ -1,80 +1,224 @@
 import asyncio
-import grpc
-from concurrent import futures
 import logging
-import threading
-import uvicorn
-from fastapi import FastAPI, status
+from collections import Counter
 from datetime import datetime
-from typing import Dict
+from typing import Callable, Dict
 
-from .bot.service import BotServiceServicer
-from .proto import bot_pb2_grpc
-from src.config.settings import Settings
+from src.config.settings import Settings, get_settings
 
-settings = Settings()
+# FastAPI, uvicorn, grpc and the generated stubs are imported when the service
+# starts rather than at module import, to keep cold start short.
 
-logging.basicConfig(level=settings.log_level, format='{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}')
+LOG_FORMAT = '{"time": "%(asctime)s", "level": "%(levelname)s", "message": "%(message)s"}'
 
 logger = logging.getLogger(__name__)
 
-# Create FastAPI app for health checks
-app = FastAPI()
-
-@app.get("/health/live", status_code=status.HTTP_200_OK)
-async def liveness_check() -> Dict:
-    """
-    Liveness probe - checks if the service is running
-    Returns 200 if the service is alive
-    """
-    return {
-        "status": "alive",
-        "service": "bot-service",
-        "timestamp": datetime.utcnow().isoformat()
-    }
-
-@app.get("/health/ready", status_code=status.HTTP_200_OK)
-async def readiness_check() -> Dict:
-    """
-    Readiness probe - checks if the service can handle requests
-    """
-    return {
-        "status": "ready",
-        "service": "bot-service",
-        "timestamp": datetime.utcnow().isoformat()
-    }
-
-def run_grpc_server(loop):
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    bot_servicer = BotServiceServicer()
-    bot_servicer.loop = loop
+
+def configure_logging(settings: Settings):
+    """Configure logging once for the whole process"""
+    logging.basicConfig(level=settings.log_level, format=LOG_FORMAT)
+
+
+def get_loop_factory(backend: str = "auto") -> Callable[[], asyncio.AbstractEventLoop]:
+    """Return a factory for the configured event loop backend"""
+    if backend in ("auto", "uvloop"):
+        try:
+            import uvloop
+            return uvloop.new_event_loop
+        except ImportError:
+            if backend == "uvloop":
+                logger.warning("uvloop is not installed, using the asyncio event loop")
+    elif backend != "asyncio":
+        logger.warning(f"Unknown loop backend {backend}, using the asyncio event loop")
+    return asyncio.new_event_loop
+
+
+def create_app():
+    """Create the FastAPI app serving health checks and metrics"""
+    from fastapi import FastAPI, HTTPException, Response, status
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI()
+    # Set once the gRPC server is accepting requests
+    app.state.servicer = None
+
+    @app.get("/health/live", status_code=status.HTTP_200_OK)
+    async def liveness_check() -> Dict:
+        """
+        Liveness probe - checks if the service is running
+        Returns 200 if the service is alive
+        """
+        return {
+            "status": "alive",
+            "service": "bot-service",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    @app.get("/health/ready", status_code=status.HTTP_200_OK)
+    async def readiness_check(response: Response) -> Dict:
+        """
+        Readiness probe - checks if the service can handle requests
+        """
+        if app.state.servicer is None or app.state.servicer.draining:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            return {
+                "status": "starting" if app.state.servicer is None else "draining",
+                "service": "bot-service",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        return {
+            "status": "ready",
+            "service": "bot-service",
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> str:
+        """
+        Prometheus metrics for the bots running in this service, or for the
+        placements of a router
+        """
+        if app.state.servicer is None:
+            return ""
+        if hasattr(app.state.servicer, "ring"):
+            return render_router_metrics(app.state.servicer)
+        return render_metrics(app.state.servicer.bot_manager)
+
+    @app.get("/debug/profile", response_class=PlainTextResponse)
+    async def profile(mode: str = "cpu", seconds: float = 10.0, interval_ms: float = 5.0, limit: int = 25) -> str:
+        """
+        Profile the bot event loop for a bounded time
+        mode=cpu returns collapsed stacks for flamegraphs, mode=memory the top allocation sites
+        """
+        from src.profiling import ProfilerBusyError
+
+        if app.state.servicer is None:
+            raise HTTPException(status.HTTP_503_SERVICE_UNAVAILABLE, "Service is starting")
+        try:
+            return await app.state.servicer.profiler.capture(mode, seconds, interval=interval_ms / 1000, limit=limit)
+        except ValueError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
+        except ProfilerBusyError as e:
+            raise HTTPException(status.HTTP_409_CONFLICT, str(e))
+
+    return app
+
+
+def render_metrics(bot_manager) -> str:
+    """Render bot counters in the Prometheus text exposition format"""
+    clients = list(bot_manager._game_clients.values())
+    metrics = [
+        ("bot_service_bots", "gauge", "Bots managed by this service", len(clients)),
+        ("bot_service_bots_alive", "gauge", "Bots whose player is alive",
+         sum(1 for c in clients if c.player_data and c.player_data.get("alive"))),
+        ("bot_service_cpu_seconds_total", "counter", "Time spent decoding, updating state and calculating moves",
+         sum(c.cpu_seconds for c in clients)),
+        ("bot_service_messages_received_total", "counter", "Game server messages received",
+         sum(c.messages_received for c in clients)),
+        ("bot_service_messages_sent_total", "counter", "Messages sent to game servers",
+         sum(c.messages_sent for c in clients)),
+        ("bot_service_send_queue_depth", "gauge", "Messages waiting in outbound queues",
+         sum(c.queue_depth for c in clients)),
+        ("bot_service_dropped_moves_total", "counter", "Superseded moves dropped from outbound queues",
+         sum(c.dropped_moves for c in clients)),
+        ("bot_service_respawns_total", "counter", "Bot respawns", sum(c.respawns for c in clients)),
+        ("bot_service_respawn_latency_seconds_total", "counter", "Time from death to respawn",
+         sum(c.total_respawn_latency for c in clients)),
+    ]
+    if bot_manager.restore_seconds is not None:
+        metrics.append(("bot_service_roster_restore_seconds", "gauge",
+                        "Time to reconnect the journaled roster after the last restart", bot_manager.restore_seconds))
+    return _format_metrics(metrics)
+
+
+def render_router_metrics(router) -> str:
+    """Render the bots and games a router placed on each replica"""
+    games = Counter(router.games.values())
+    metrics = [
+        ("bot_router_bots", "gauge", "Bots routed to a replica",
+         [(f'replica="{replica}"', router.loads[replica]) for replica in router.ring.replicas]),
+        ("bot_router_games", "gauge", "Games placed on a replica",
+         [(f'replica="{replica}"', games[replica]) for replica in router.ring.replicas]),
+    ]
+    return _format_metrics(metrics)
+
+
+def _format_metrics(metrics) -> str:
+    """Format (name, type, help, value) tuples, where value may be a list of (labels, value)"""
+    lines = []
+    for name, metric_type, help_text, value in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if isinstance(value, list):
+            lines.extend(f"{name}{{{labels}}} {sample}" for labels, sample in value)
+        else:
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+async def serve_async(settings: Settings):
+    """Serve gRPC, health checks and metrics on the running event loop"""
+    import grpc
+    import uvicorn
+
+    from .bot.service import BotServiceServicer
+    from .proto import bot_pb2_grpc
+
+    app = create_app()
+    http_server = uvicorn.Server(
+        uvicorn.Config(app, host="0.0.0.0", port=settings.http_port, log_config=None)
+    )
+
+    if settings.router_replicas:
+        from .bot.router import RouterServicer
+
+        # Route bots to the replicas by game instead of running them here
+        bot_servicer = RouterServicer(settings)
+        await bot_servicer.sync()
+    else:
+        bot_servicer = BotServiceServicer(settings)
+
+    server = grpc.aio.server()
     bot_pb2_grpc.add_BotServiceServicer_to_server(bot_servicer, server)
     server.add_insecure_port(f'[::]:{settings.grpc_port}')
-    server.start()
-    logger.info(f"Bot service started on port {settings.grpc_port}")
-    server.wait_for_termination()
+    await server.start()
+    app.state.servicer = bot_servicer
+    if settings.router_replicas:
+        logger.info(f"Bot router for {', '.join(settings.router_replicas)} started on port {settings.grpc_port}")
+    else:
+        logger.info(f"Bot service started on port {settings.grpc_port}")
+
+    background_tasks = []
+    bot_manager = getattr(bot_servicer, "bot_manager", None)
+    if settings.router_replicas:
+        background_tasks.append(asyncio.create_task(bot_servicer.sync_periodically(settings.router_sync_interval)))
+    if bot_manager and bot_manager.journal:
+        background_tasks.append(asyncio.create_task(bot_manager.restore(settings.roster_restore_stagger)))
+        background_tasks.append(
+            asyncio.create_task(bot_manager.compact_roster_periodically(settings.roster_compact_interval))
+        )
+
+    try:
+        await http_server.serve()
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await server.stop(grace=5)
+        if settings.router_replicas:
+            await bot_servicer.close()
 
-def run_fastapi_server():
-    uvicorn.run(app, host="0.0.0.0", port=8080)
 
 def serve():
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    # Start gRPC server in a thread
-    server_thread = threading.Thread(target=run_grpc_server, args=(loop,))
-    server_thread.start()
-    
-    # Start FastAPI server in a thread
-    health_thread = threading.Thread(target=run_fastapi_server)
-    health_thread.start()
-    
+    settings = get_settings()
+    configure_logging(settings)
+    loop_factory = get_loop_factory(settings.loop_backend)
+    logger.info(f"Using {loop_factory.__module__} event loop")
     try:
-        loop.run_forever()
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(serve_async(settings))
     except KeyboardInterrupt:
         pass
-    finally:
-        loop.close()
+
 
 if __name__ == '__main__':
-    serve()
\ No newline at end of file
+    serve()
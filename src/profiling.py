@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cpu", "memory")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a capture is requested while another one is running"""
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    filename = os.path.join(*code.co_filename.split(os.sep)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class Profiler:
+    """Time-bounded captures of the event loop thread, one at a time.
+
+    "cpu" samples the loop thread's stack on a CPU-time timer, which costs
+    the loop nothing between samples, and returns collapsed stacks that can
+    be fed to flamegraph.pl or speedscope. "memory" traces allocations with
+    tracemalloc for the duration and returns the lines that allocated most.
+    """
+
+    def __init__(self, max_seconds: float = 30.0):
+        self.max_seconds = max_seconds
+        self._lock = asyncio.Lock()
+
+    async def capture(self, mode: str, seconds: float, interval: float = 0.005, limit: int = 25) -> str:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode}, expected one of {', '.join(PROFILE_MODES)}")
+        if seconds <= 0:
+            raise ValueError("Profile duration must be positive")
+        if self._lock.locked():
+            raise ProfilerBusyError("Another profile is already running")
+
+        seconds = min(seconds, self.max_seconds)
+        async with self._lock:
+            logger.info(f"Capturing {mode} profile for {seconds}s")
+            if mode == "cpu":
+                return await self._sample_stacks(seconds, max(interval, 0.001))
+            return await self._top_allocations(seconds, limit)
+
+    async def _sample_stacks(self, seconds: float, interval: float) -> str:
+        stacks: Counter = Counter()
+
+        def record(frame):
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stacks[";".join(reversed(stack))] += 1
+
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "setitimer"):
+            # SIGPROF fires after every interval of CPU time and the handler runs
+            # on the loop thread, so samples land where the loop spends CPU
+            # rather than where it happens to release the GIL
+            previous = signal.signal(signal.SIGPROF, lambda signum, frame: record(frame))
+            signal.setitimer(signal.ITIMER_PROF, interval, interval)
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                signal.setitimer(signal.ITIMER_PROF, 0)
+                signal.signal(signal.SIGPROF, previous)
+        else:
+            # Sample wall-clock stacks of the loop thread from a helper thread
+            loop_thread = threading.get_ident()
+            stop = threading.Event()
+
+            def sample():
+                while not stop.wait(interval):
+                    frame = sys._current_frames().get(loop_thread)
+                    if frame is not None:
+                        record(frame)
+
+            sampler = threading.Thread(target=sample, name="profiler", daemon=True)
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    async def _top_allocations(self, seconds: float, limit: int) -> str:
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            started = time.monotonic()
+            await asyncio.sleep(seconds)
+            after = tracemalloc.take_snapshot()
+            elapsed = time.monotonic() - started
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+        lines = [f"# top {limit} allocation sites over {elapsed:.1f}s (size diff, count diff, location)"]
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size_diff:+d} B\t{stat.count_diff:+d}\t{frame.filename}:{frame.lineno}")
+        return "\n".join(lines) + "\n"
@@ -22,9 +22,10 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\tbot.proto\x12\x03\x62ot\"<\n\x03\x42ot\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x12\n\ndifficulty\x18\x02 \x01(\t\x12\x10\n\x08strategy\x18\x03 \x01(\t\"a\n\x10\x43reateBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x15\n\x03\x62ot\x18\x02 \x01(\x0b\x32\x08.bot.Bot\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x03 \x01(\t\x12\x10\n\x08hostname\x18\x04 \x01(\t\"3\n\x11\x43reateBotResponse\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"\"\n\x10\x44\x65leteBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\"\x07\n\x05\x45mpty\"\x1f\n\rGetBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\"x\n\x10ListBotsResponse\x12-\n\x04\x62ots\x18\x01 \x03(\x0b\x32\x1f.bot.ListBotsResponse.BotsEntry\x1a\x35\n\tBotsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x17\n\x05value\x18\x02 \x01(\x0b\x32\x08.bot.Bot:\x02\x38\x01\x32\xd7\x01\n\nBotService\x12<\n\tCreateBot\x12\x15.bot.CreateBotRequest\x1a\x16.bot.CreateBotResponse\"\x00\x12\x30\n\tDeleteBot\x12\x15.bot.DeleteBotRequest\x1a\n.bot.Empty\"\x00\x12(\n\x06GetBot\x12\x12.bot.GetBotRequest\x1a\x08.bot.Bot\"\x00\x12/\n\x08ListBots\x12\n.bot.Empty\x1a\x15.bot.ListBotsResponse\"\x00\x42\x05Z\x03../b\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\tbot.proto\x12\x03\x62ot\x1a google/protobuf/field_mask.proto\"N\n\x03\x42ot\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x12\n\ndifficulty\x18\x02 \x01(\t\x12\x15\n\x08strategy\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_strategy\"a\n\x10\x43reateBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x15\n\x03\x62ot\x18\x02 \x01(\x0b\x32\x08.bot.Bot\x12\x14\n\x0c\x61\x63\x63\x65ss_token\x18\x03 \x01(\t\x12\x10\n\x08hostname\x18\x04 \x01(\t\"3\n\x11\x43reateBotResponse\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\"\"\n\x10\x44\x65leteBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\"\x07\n\x05\x45mpty\"\x1f\n\rGetBotRequest\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\"\x97\x01\n\x0fListBotsRequest\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x1c\n\x05state\x18\x02 \x01(\x0e\x32\r.bot.BotState\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x12\n\npage_token\x18\x04 \x01(\t\x12.\n\nfield_mask\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"\xa8\x01\n\tBotStatus\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x15\n\x03\x62ot\x18\x02 \x01(\x0b\x32\x08.bot.Bot\x12\x1c\n\x05state\x18\x03 \x01(\x0e\x32\r.bot.BotState\x12\x11\n\tconnected\x18\x04 \x01(\x08\x12\r\n\x05\x61live\x18\x05 \x01(\x08\x12 \n\x18last_message_age_seconds\x18\x06 \x01(\x01\x12\x12\n\nmoves_sent\x18\x07 \x01(\x03\"\xb3\x01\n\x10ListBotsResponse\x12-\n\x04\x62ots\x18\x01 \x03(\x0b\x32\x1f.bot.ListBotsResponse.BotsEntry\x12 \n\x08statuses\x18\x02 \x03(\x0b\x32\x0e.bot.BotStatus\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\t\x1a\x35\n\tBotsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x17\n\x05value\x18\x02 \x01(\x0b\x32\x08.bot.Bot:\x02\x38\x01\"#\n\x12GetBotStatsRequest\x12\r\n\x05top_n\x18\x01 \x01(\x05\"\xbe\x02\n\x08\x42otStats\x12\x0e\n\x06\x62ot_id\x18\x01 \x01(\t\x12\x0f\n\x07game_id\x18\x02 \x01(\t\x12\x16\n\x0e\x64\x65\x63ode_seconds\x18\x03 \x01(\x01\x12\x16\n\x0eupdate_seconds\x18\x04 \x01(\x01\x12\x14\n\x0cmove_seconds\x18\x05 \x01(\x01\x12\x15\n\rtotal_seconds\x18\x06 \x01(\x01\x12\x18\n\x10max_tick_seconds\x18\x07 \x01(\x01\x12\x19\n\x11messages_received\x18\x08 \x01(\x03\x12\x18\n\x10moves_calculated\x18\t \x01(\x03\x12\x13\n\x0bqueue_depth\x18\n \x01(\x05\x12\x15\n\rdropped_moves\x18\x0b \x01(\x03\x12\x10\n\x08respawns\x18\x0c \x01(\x03\x12\'\n\x1f\x61verage_respawn_latency_seconds\x18\r \x01(\x01\"A\n\tGameStats\x12\x0f\n\x07game_id\x18\x01 \x01(\t\x12\x0c\n\x04\x62ots\x18\x02 \x01(\x05\x12\x15\n\rtotal_seconds\x18\x03 \x01(\x01\"Q\n\x13GetBotStatsResponse\x12\x1b\n\x04\x62ots\x18\x01 \x03(\x0b\x32\r.bot.BotStats\x12\x1d\n\x05games\x18\x02 \x03(\x0b\x32\x0e.bot.GameStats\"V\n\x10\x44rainBotsRequest\x12\x0e\n\x06target\x18\x01 \x01(\t\x12\x12\n\nbatch_size\x18\x02 \x01(\x05\x12\x1e\n\x16\x62\x61tch_interval_seconds\x18\x03 \x01(\x01\"\x8c\x01\n\x11\x44rainBotsProgress\x12\r\n\x05total\x18\x01 \x01(\x05\x12\x10\n\x08migrated\x18\x02 \x01(\x05\x12\x0e\n\x06\x66\x61iled\x18\x03 \x01(\x05\x12\x11\n\tremaining\x18\x04 \x01(\x05\x12\x0c\n\x04\x64one\x18\x05 \x01(\x08\x12\x16\n\x0e\x66\x61iled_bot_ids\x18\x06 \x03(\t\x12\r\n\x05\x65rror\x18\x07 \x01(\t\"a\n\x0eProfileRequest\x12\x0c\n\x04mode\x18\x01 \x01(\t\x12\x18\n\x10\x64uration_seconds\x18\x02 \x01(\x01\x12\x18\n\x10interval_seconds\x18\x03 \x01(\x01\x12\r\n\x05limit\x18\x04 \x01(\x05\"/\n\x0fProfileResponse\x12\x0e\n\x06\x66ormat\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t*\x7f\n\x08\x42otState\x12\x19\n\x15\x42OT_STATE_UNSPECIFIED\x10\x00\x12\x18\n\x14\x42OT_STATE_CONNECTING\x10\x01\x12\x15\n\x11\x42OT_STATE_JOINING\x10\x02\x12\x13\n\x0f\x42OT_STATE_ALIVE\x10\x03\x12\x12\n\x0e\x42OT_STATE_DEAD\x10\x04\x32\x9d\x03\n\nBotService\x12<\n\tCreateBot\x12\x15.bot.CreateBotRequest\x1a\x16.bot.CreateBotResponse\"\x00\x12\x30\n\tDeleteBot\x12\x15.bot.DeleteBotRequest\x1a\n.bot.Empty\"\x00\x12(\n\x06GetBot\x12\x12.bot.GetBotRequest\x1a\x08.bot.Bot\"\x00\x12\x39\n\x08ListBots\x12\x14.bot.ListBotsRequest\x1a\x15.bot.ListBotsResponse\"\x00\x12\x42\n\x0bGetBotStats\x12\x17.bot.GetBotStatsRequest\x1a\x18.bot.GetBotStatsResponse\"\x00\x12>\n\tDrainBots\x12\x15.bot.DrainBotsRequest\x1a\x16.bot.DrainBotsProgress\"\x00\x30\x01\x12\x36\n\x07Profile\x12\x13.bot.ProfileRequest\x1a\x14.bot.ProfileResponse\"\x00\x42\x05Z\x03../b\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -34,22 +35,44 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['DESCRIPTOR']._serialized_options = b'Z\003../'
   _globals['_LISTBOTSRESPONSE_BOTSENTRY']._loaded_options = None
   _globals['_LISTBOTSRESPONSE_BOTSENTRY']._serialized_options = b'8\001'
-  _globals['_BOT']._serialized_start=18
-  _globals['_BOT']._serialized_end=78
-  _globals['_CREATEBOTREQUEST']._serialized_start=80
-  _globals['_CREATEBOTREQUEST']._serialized_end=177
-  _globals['_CREATEBOTRESPONSE']._serialized_start=179
-  _globals['_CREATEBOTRESPONSE']._serialized_end=230
-  _globals['_DELETEBOTREQUEST']._serialized_start=232
-  _globals['_DELETEBOTREQUEST']._serialized_end=266
-  _globals['_EMPTY']._serialized_start=268
-  _globals['_EMPTY']._serialized_end=275
-  _globals['_GETBOTREQUEST']._serialized_start=277
-  _globals['_GETBOTREQUEST']._serialized_end=308
-  _globals['_LISTBOTSRESPONSE']._serialized_start=310
-  _globals['_LISTBOTSRESPONSE']._serialized_end=430
-  _globals['_LISTBOTSRESPONSE_BOTSENTRY']._serialized_start=377
-  _globals['_LISTBOTSRESPONSE_BOTSENTRY']._serialized_end=430
-  _globals['_BOTSERVICE']._serialized_start=433
-  _globals['_BOTSERVICE']._serialized_end=648
+  _globals['_BOTSTATE']._serialized_start=1756
+  _globals['_BOTSTATE']._serialized_end=1883
+  _globals['_BOT']._serialized_start=52
+  _globals['_BOT']._serialized_end=130
+  _globals['_CREATEBOTREQUEST']._serialized_start=132
+  _globals['_CREATEBOTREQUEST']._serialized_end=229
+  _globals['_CREATEBOTRESPONSE']._serialized_start=231
+  _globals['_CREATEBOTRESPONSE']._serialized_end=282
+  _globals['_DELETEBOTREQUEST']._serialized_start=284
+  _globals['_DELETEBOTREQUEST']._serialized_end=318
+  _globals['_EMPTY']._serialized_start=320
+  _globals['_EMPTY']._serialized_end=327
+  _globals['_GETBOTREQUEST']._serialized_start=329
+  _globals['_GETBOTREQUEST']._serialized_end=360
+  _globals['_LISTBOTSREQUEST']._serialized_start=363
+  _globals['_LISTBOTSREQUEST']._serialized_end=514
+  _globals['_BOTSTATUS']._serialized_start=517
+  _globals['_BOTSTATUS']._serialized_end=685
+  _globals['_LISTBOTSRESPONSE']._serialized_start=688
+  _globals['_LISTBOTSRESPONSE']._serialized_end=867
+  _globals['_LISTBOTSRESPONSE_BOTSENTRY']._serialized_start=814
+  _globals['_LISTBOTSRESPONSE_BOTSENTRY']._serialized_end=867
+  _globals['_GETBOTSTATSREQUEST']._serialized_start=869
+  _globals['_GETBOTSTATSREQUEST']._serialized_end=904
+  _globals['_BOTSTATS']._serialized_start=907
+  _globals['_BOTSTATS']._serialized_end=1225
+  _globals['_GAMESTATS']._serialized_start=1227
+  _globals['_GAMESTATS']._serialized_end=1292
+  _globals['_GETBOTSTATSRESPONSE']._serialized_start=1294
+  _globals['_GETBOTSTATSRESPONSE']._serialized_end=1375
+  _globals['_DRAINBOTSREQUEST']._serialized_start=1377
+  _globals['_DRAINBOTSREQUEST']._serialized_end=1463
+  _globals['_DRAINBOTSPROGRESS']._serialized_start=1466
+  _globals['_DRAINBOTSPROGRESS']._serialized_end=1606
+  _globals['_PROFILEREQUEST']._serialized_start=1608
+  _globals['_PROFILEREQUEST']._serialized_end=1705
+  _globals['_PROFILERESPONSE']._serialized_start=1707
+  _globals['_PROFILERESPONSE']._serialized_end=1754
+  _globals['_BOTSERVICE']._serialized_start=1886
+  _globals['_BOTSERVICE']._serialized_end=2299
 # @@protoc_insertion_point(module_scope)
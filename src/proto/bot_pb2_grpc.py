@@ -52,9 +52,24 @@ class BotServiceStub(object):
                 _registered_method=True)
         self.ListBots = channel.unary_unary(
                 '/bot.BotService/ListBots',
-                request_serializer=bot__pb2.Empty.SerializeToString,
+                request_serializer=bot__pb2.ListBotsRequest.SerializeToString,
                 response_deserializer=bot__pb2.ListBotsResponse.FromString,
                 _registered_method=True)
+        self.GetBotStats = channel.unary_unary(
+                '/bot.BotService/GetBotStats',
+                request_serializer=bot__pb2.GetBotStatsRequest.SerializeToString,
+                response_deserializer=bot__pb2.GetBotStatsResponse.FromString,
+                _registered_method=True)
+        self.DrainBots = channel.unary_stream(
+                '/bot.BotService/DrainBots',
+                request_serializer=bot__pb2.DrainBotsRequest.SerializeToString,
+                response_deserializer=bot__pb2.DrainBotsProgress.FromString,
+                _registered_method=True)
+        self.Profile = channel.unary_unary(
+                '/bot.BotService/Profile',
+                request_serializer=bot__pb2.ProfileRequest.SerializeToString,
+                response_deserializer=bot__pb2.ProfileResponse.FromString,
+                _registered_method=True)
 
 
 class BotServiceServicer(object):
@@ -83,7 +98,28 @@ class BotServiceServicer(object):
         raise NotImplementedError('Method not implemented!')
 
     def ListBots(self, request, context):
-        """List all active bots
+        """List bots with their runtime status, optionally filtered and paginated
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetBotStats(self, request, context):
+        """Get CPU statistics of the hottest bots
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DrainBots(self, request, context):
+        """Stop accepting bots and hand off all bots to another bot service
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Profile(self, request, context):
+        """Profile the bot event loop
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -109,9 +145,24 @@ def add_BotServiceServicer_to_server(servicer, server):
             ),
             'ListBots': grpc.unary_unary_rpc_method_handler(
                     servicer.ListBots,
-                    request_deserializer=bot__pb2.Empty.FromString,
+                    request_deserializer=bot__pb2.ListBotsRequest.FromString,
                     response_serializer=bot__pb2.ListBotsResponse.SerializeToString,
             ),
+            'GetBotStats': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetBotStats,
+                    request_deserializer=bot__pb2.GetBotStatsRequest.FromString,
+                    response_serializer=bot__pb2.GetBotStatsResponse.SerializeToString,
+            ),
+            'DrainBots': grpc.unary_stream_rpc_method_handler(
+                    servicer.DrainBots,
+                    request_deserializer=bot__pb2.DrainBotsRequest.FromString,
+                    response_serializer=bot__pb2.DrainBotsProgress.SerializeToString,
+            ),
+            'Profile': grpc.unary_unary_rpc_method_handler(
+                    servicer.Profile,
+                    request_deserializer=bot__pb2.ProfileRequest.FromString,
+                    response_serializer=bot__pb2.ProfileResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bot.BotService', rpc_method_handlers)
@@ -220,7 +271,7 @@ class BotService(object):
             request,
             target,
             '/bot.BotService/ListBots',
-            bot__pb2.Empty.SerializeToString,
+            bot__pb2.ListBotsRequest.SerializeToString,
             bot__pb2.ListBotsResponse.FromString,
             options,
             channel_credentials,
@@ -231,3 +282,84 @@ class BotService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetBotStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bot.BotService/GetBotStats',
+            bot__pb2.GetBotStatsRequest.SerializeToString,
+            bot__pb2.GetBotStatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DrainBots(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bot.BotService/DrainBots',
+            bot__pb2.DrainBotsRequest.SerializeToString,
+            bot__pb2.DrainBotsProgress.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Profile(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bot.BotService/Profile',
+            bot__pb2.ProfileRequest.SerializeToString,
+            bot__pb2.ProfileResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: game.proto
+# Protobuf Python Version: 5.28.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    5,
+    28,
+    1,
+    '',
+    'game.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\ngame.proto\x12\x04game\".\n\x06\x43ircle\x12\t\n\x01x\x18\x01 \x01(\x01\x12\t\n\x01y\x18\x02 \x01(\x01\x12\x0e\n\x06radius\x18\x03 \x01(\x01\"J\n\x06Player\x12\x13\n\x0bplayer_name\x18\x01 \x01(\t\x12\r\n\x05\x61live\x18\x02 \x01(\x08\x12\x1c\n\x06\x63ircle\x18\x03 \x01(\x0b\x32\x0c.game.Circle\"3\n\x04\x46ood\x12\r\n\x05index\x18\x01 \x01(\x05\x12\x1c\n\x06\x63ircle\x18\x02 \x01(\x0b\x32\x0c.game.Circle\"\x1b\n\x04Join\x12\x13\n\x0bplayer_name\x18\x01 \x01(\t\"\x1c\n\x04Move\x12\t\n\x01x\x18\x01 \x01(\x01\x12\t\n\x01y\x18\x02 \x01(\x01\"D\n\tGameState\x12\x1d\n\x07players\x18\x01 \x03(\x0b\x32\x0c.game.Player\x12\x18\n\x04\x66ood\x18\x02 \x03(\x0b\x32\n.game.Food\"A\n\x06Update\x12\x1d\n\x07players\x18\x01 \x03(\x0b\x32\x0c.game.Player\x12\x18\n\x04\x66ood\x18\x02 \x03(\x0b\x32\n.game.Food\"\xb6\x01\n\x0bGameMessage\x12\x1a\n\x04join\x18\x01 \x01(\x0b\x32\n.game.JoinH\x00\x12\x1a\n\x04move\x18\x02 \x01(\x0b\x32\n.game.MoveH\x00\x12%\n\ngame_state\x18\x03 \x01(\x0b\x32\x0f.game.GameStateH\x00\x12\x1e\n\x06update\x18\x04 \x01(\x0b\x32\x0c.game.UpdateH\x00\x12\x1d\n\x05spawn\x18\x05 \x01(\x0b\x32\x0c.game.PlayerH\x00\x42\t\n\x07payloadB\x05Z\x03../b\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'game_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'Z\003../'
+  _globals['_CIRCLE']._serialized_start=20
+  _globals['_CIRCLE']._serialized_end=66
+  _globals['_PLAYER']._serialized_start=68
+  _globals['_PLAYER']._serialized_end=142
+  _globals['_FOOD']._serialized_start=144
+  _globals['_FOOD']._serialized_end=195
+  _globals['_JOIN']._serialized_start=197
+  _globals['_JOIN']._serialized_end=224
+  _globals['_MOVE']._serialized_start=226
+  _globals['_MOVE']._serialized_end=254
+  _globals['_GAMESTATE']._serialized_start=256
+  _globals['_GAMESTATE']._serialized_end=324
+  _globals['_UPDATE']._serialized_start=326
+  _globals['_UPDATE']._serialized_end=391
+  _globals['_GAMEMESSAGE']._serialized_start=394
+  _globals['_GAMEMESSAGE']._serialized_end=576
+# @@protoc_insertion_point(module_scope)
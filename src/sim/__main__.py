@@ -0,0 +1,49 @@
+"""Run headless bot simulations and compare strategies.
+
+    python -m src.sim --bots 10000 --food 100000 --ticks 20 --strategies greedy,random
+"""
+import argparse
+import asyncio
+import json
+import logging
+
+from .simulator import Simulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--food", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--strategies", default="greedy,random")
+    parser.add_argument("--difficulty", default="")
+    parser.add_argument("--protocol", default="json", choices=["json", "protobuf"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--separate-worlds", action="store_true",
+        help="give every bot its own game world, so each bot pays for applying every frame",
+    )
+    parser.add_argument("--json", action="store_true", help="print one JSON report per strategy")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if not args.json:
+        print(f"{args.bots} bots, {args.food} food, {args.ticks} ticks, seed {args.seed}")
+        print(f"{'strategy':<10}{'strategy s':>11}{'client s':>10}{'physics s':>11}{'wall s':>9}"
+              f"{'eaten':>9}{'kills':>7}{'mean r':>8}")
+    for strategy in args.strategies.split(","):
+        simulator = Simulator(
+            args.bots, args.food, strategy=strategy, difficulty=args.difficulty,
+            protocol=args.protocol, seed=args.seed, shared_world=not args.separate_worlds,
+        )
+        report = asyncio.run(simulator.run(args.ticks))
+        if args.json:
+            print(json.dumps({"strategy": strategy, **report}))
+            continue
+        print(f"{strategy:<10}{report['strategy_seconds']:>11.3f}{report['client_seconds']:>10.3f}"
+              f"{report['physics_seconds']:>11.3f}{report['wall_seconds']:>9.2f}"
+              f"{report['food_eaten']:>9}{report['kills']:>7}{report['mean_radius']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
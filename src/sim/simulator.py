@@ -0,0 +1,267 @@
+import itertools
+import logging
+import math
+import random
+import time
+from typing import Dict, List, Optional
+
+from src.bot.game_client import GameClient
+from src.bot.protocol import JSON_CODEC, PROTOBUF_CODEC
+
+logger = logging.getLogger(__name__)
+
+PLAYER_RADIUS = 10.0
+FOOD_RADIUS = 5.0
+# Units per second of a player with the initial radius, bigger players are slower
+BASE_SPEED = 300.0
+# A player eats another one that is this much smaller
+EAT_RATIO = 1.1
+# Size of the spatial hash cells
+CELL_SIZE = 64.0
+
+# Gives every simulator its own GameWorlds, even with equal seeds
+_simulation_ids = itertools.count()
+
+
+class _SimulatedSocket:
+    """Stands in for the websocket so clients queue messages for the simulator"""
+
+    async def close(self):
+        pass
+
+
+class Simulator:
+    """In-process game server driving GameClients without websockets.
+
+    Implements enough of the game's circle physics (movement, eating food and
+    smaller players, respawning) to exercise client state handling and
+    strategies. Each tick the update frame is encoded and decoded once and
+    every bot receives the decoded message through GameClient.handle_message,
+    decides through GameClient.decide, and its queued messages are applied
+    directly. Everything is driven by a seeded RNG, so a
+    run is reproducible.
+
+    Like bots of one game in a pod, the clients share one GameWorld by
+    default, which only one of them updates. With shared_world=False every
+    client gets its own world and applies every frame, as bots spread over
+    pods would.
+    """
+
+    def __init__(
+        self,
+        bots: int,
+        food: int,
+        strategy: str = "greedy",
+        difficulty: str = "",
+        world_size: Optional[float] = None,
+        tick: float = 0.03,
+        protocol: str = "json",
+        seed: int = 0,
+        shared_world: bool = True,
+    ):
+        self.rng = random.Random(seed)
+        self.tick = tick
+        # keep the food density constant when no size is given
+        self.world_size = world_size or max(1000.0, math.sqrt(food) * 50)
+        self.codec = PROTOBUF_CODEC if protocol == "protobuf" else JSON_CODEC
+        self.game_id = f"sim-{next(_simulation_ids)}"
+
+        self.food: List[dict] = []
+        self.food_cells: Dict[tuple, set] = {}
+        for index in range(food):
+            self.food.append({"index": index, "circle": {"x": 0.0, "y": 0.0, "radius": FOOD_RADIUS}})
+            self._place_food(index)
+
+        self.players: Dict[str, dict] = {}
+        self.directions: Dict[str, tuple] = {}
+        self._changed_players: Dict[str, dict] = {}
+        self._changed_food: Dict[int, dict] = {}
+
+        client_rng = random.Random(seed + 1)
+        self.clients = [
+            GameClient(
+                game_id=self.game_id,
+                player_name=f"bot-{i}",
+                strategy=strategy,
+                # worlds are shared by host, port and game
+                host_name="simulator" if shared_world else f"simulator-{i}",
+                game_port=0,
+                difficulty=difficulty,
+                respawn_timeout=math.inf,
+                slow_tick_threshold=0,
+                rng=client_rng,
+            )
+            for i in range(bots)
+        ]
+        for client in self.clients:
+            client.ws = _SimulatedSocket()
+            client.connected = True
+            client.codec = self.codec
+
+        self.ticks = 0
+        self.food_eaten = 0
+        self.kills = 0
+        self.respawns = 0
+        self.physics_seconds = 0.0
+        self.frame_seconds = 0.0
+        self._started = False
+
+    def _cell(self, x: float, y: float) -> tuple:
+        return int(x // CELL_SIZE), int(y // CELL_SIZE)
+
+    def _cells_around(self, circle: dict):
+        x, y, r = circle["x"], circle["y"], circle["radius"]
+        min_x, min_y = self._cell(x - r, y - r)
+        max_x, max_y = self._cell(x + r, y + r)
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                yield cx, cy
+
+    def _place_food(self, index: int):
+        """Move a food item to a random position"""
+        circle = self.food[index]["circle"]
+        cell = self.food_cells.get(self._cell(circle["x"], circle["y"]))
+        if cell is not None:
+            cell.discard(index)
+        food = {
+            "index": index,
+            "circle": {
+                "x": self.rng.uniform(0, self.world_size),
+                "y": self.rng.uniform(0, self.world_size),
+                "radius": FOOD_RADIUS,
+            },
+        }
+        self.food[index] = food
+        self.food_cells.setdefault(self._cell(food["circle"]["x"], food["circle"]["y"]), set()).add(index)
+        return food
+
+    def _spawn(self, name: str):
+        if name in self.players and self.players[name]["alive"]:
+            return
+        if name in self.players:
+            self.respawns += 1
+        player = {
+            "playerName": name,
+            "alive": True,
+            "circle": {
+                "x": self.rng.uniform(0, self.world_size),
+                "y": self.rng.uniform(0, self.world_size),
+                "radius": PLAYER_RADIUS,
+            },
+        }
+        self.players[name] = player
+        self.directions[name] = (0.0, 0.0)
+        self._changed_players[name] = player
+
+    def _receive(self, client: GameClient):
+        """Apply the messages a client queued"""
+        for message in client.take_messages():
+            if message["type"] == "join":
+                self._spawn(message["data"]["playerName"])
+            elif message["type"] == "move":
+                self.directions[client.player_name] = (message["data"]["x"], message["data"]["y"])
+
+    def _advance(self):
+        """Move players, then let them eat food and smaller players"""
+        started = time.perf_counter()
+        alive = [p for p in self.players.values() if p["alive"]]
+
+        player_cells: Dict[tuple, list] = {}
+        for player in alive:
+            circle = player["circle"]
+            dx, dy = self.directions[player["playerName"]]
+            speed = BASE_SPEED * math.sqrt(PLAYER_RADIUS / circle["radius"]) * self.tick
+            circle["x"] = min(max(circle["x"] + dx * speed, 0.0), self.world_size)
+            circle["y"] = min(max(circle["y"] + dy * speed, 0.0), self.world_size)
+            self._changed_players[player["playerName"]] = player
+            player_cells.setdefault(self._cell(circle["x"], circle["y"]), []).append(player)
+
+        for player in alive:
+            if not player["alive"]:
+                continue
+            circle = player["circle"]
+            x, y = circle["x"], circle["y"]
+            area = circle["radius"] ** 2
+            for cell in self._cells_around(circle):
+                for index in list(self.food_cells.get(cell, ())):
+                    food = self.food[index]["circle"]
+                    if (food["x"] - x) ** 2 + (food["y"] - y) ** 2 < circle["radius"] ** 2:
+                        area += food["radius"] ** 2
+                        self.food_eaten += 1
+                        self._changed_food[index] = self._place_food(index)
+                for other in player_cells.get(cell, ()):
+                    other_circle = other["circle"]
+                    if (
+                        other["alive"]
+                        and other_circle["radius"] * EAT_RATIO < circle["radius"]
+                        and (other_circle["x"] - x) ** 2 + (other_circle["y"] - y) ** 2 < circle["radius"] ** 2
+                    ):
+                        other["alive"] = False
+                        area += other_circle["radius"] ** 2
+                        self.kills += 1
+                        self._changed_players[other["playerName"]] = other
+            circle["radius"] = math.sqrt(area)
+        self.physics_seconds += time.perf_counter() - started
+
+    def _next_message(self) -> dict:
+        """Encode the tick's frame and decode it once for every bot"""
+        started = time.perf_counter()
+        if not self._started:
+            self._started = True
+            message = {"type": "gameState", "data": {"players": list(self.players.values()), "food": self.food}}
+        else:
+            message = {
+                "type": "update",
+                "data": {"players": list(self._changed_players.values()), "food": list(self._changed_food.values())},
+            }
+        self._changed_players = {}
+        self._changed_food = {}
+        # a round trip through the codec, so bots do not share the simulator's own objects
+        message = self.codec.decode(self.codec.encode(message))
+        self.frame_seconds += time.perf_counter() - started
+        return message
+
+    async def start(self):
+        """Let every bot join, as connecting would"""
+        for client in self.clients:
+            await client.send_join_message()
+            self._receive(client)
+
+    async def step(self):
+        """Run one server tick"""
+        message = self._next_message()
+        for client in self.clients:
+            await client.handle_message(message)
+            await client.decide()
+            self._receive(client)
+        self._advance()
+        self.ticks += 1
+
+    async def run(self, ticks: int) -> dict:
+        """Run the simulation and return its outcome and costs"""
+        started = time.perf_counter()
+        if not self._started:
+            await self.start()
+        for _ in range(ticks):
+            await self.step()
+        return self.report(time.perf_counter() - started)
+
+    def report(self, wall_seconds: float = 0.0) -> dict:
+        alive = [p for p in self.players.values() if p["alive"]]
+        radii = [p["circle"]["radius"] for p in alive]
+        return {
+            "bots": len(self.clients),
+            "food": len(self.food),
+            "ticks": self.ticks,
+            "food_eaten": self.food_eaten,
+            "kills": self.kills,
+            "respawns": self.respawns,
+            "alive": len(alive),
+            "mean_radius": sum(radii) / len(radii) if radii else 0.0,
+            "max_radius": max(radii, default=0.0),
+            "strategy_seconds": sum(c.move_seconds for c in self.clients),
+            "client_seconds": sum(c.cpu_seconds for c in self.clients),
+            "physics_seconds": self.physics_seconds,
+            "frame_seconds": self.frame_seconds,
+            "wall_seconds": wall_seconds,
+        }
@@ -1,7 +1,63 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
+
+import grpc
+import pytest
+
+from src.bot.game_client import RespawnState
+from src.bot.service import BotServiceServicer
+from src.config.settings import Settings
+from src.proto import bot_pb2_grpc
 
 # Add the src directory to the Python path
 src_path = str(Path(__file__).parent.parent / "src")
-sys.path.append(src_path)
\ No newline at end of file
+sys.path.append(src_path)
+
+
+class FakeGameClient:
+    """Stands in for GameClient, running until cancelled without any network"""
+
+    def __init__(self, game_id, player_name, **kwargs):
+        self.game_id = game_id
+        self.player_name = player_name
+        self.access_token = kwargs.get("access_token")
+        self.ws = None
+        self.connected = True
+        self.respawn_state = RespawnState.ALIVE
+        self.alive = True
+        self.last_message_at = None
+        self.moves_sent = 0
+        # statistics read by GetBotStats
+        self.decode_seconds = self.update_seconds = self.move_seconds = self.cpu_seconds = 0.0
+        self.max_tick_seconds = 0.0
+        self.messages_received = self.moves_calculated = self.queue_depth = 0
+        self.dropped_moves = self.respawns = 0
+        self.average_respawn_latency = None
+
+    async def run(self):
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def fake_game_client():
+    """Create bots in BotManager with FakeGameClient"""
+    with patch("src.bot.service.GameClient", FakeGameClient):
+        yield
+
+
+@pytest.fixture
+def start_service():
+    """Return a coroutine starting a BotService on a free local port"""
+
+    async def start(settings=None):
+        server = grpc.aio.server()
+        servicer = BotServiceServicer(settings or Settings())
+        bot_pb2_grpc.add_BotServiceServicer_to_server(servicer, server)
+        port = server.add_insecure_port("localhost:0")
+        await server.start()
+        return server, servicer, f"localhost:{port}"
+
+    return start
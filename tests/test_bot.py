@@ -1,9 +1,14 @@
+import asyncio
+import json
 import pytest
+from pydantic import ValidationError
 from unittest.mock import MagicMock, AsyncMock, patch
 from src.bot.strategy import BotStrategy
-from src.bot.game_client import GameClient
+from src.bot.game_client import GameClient, RespawnState
 from src.bot.bot_manager import BotManager, BotInstance
+from src.bot.service import BotManager as ServiceBotManager
 from src.config.settings import Settings
+from src.main import get_loop_factory
 
 settings = Settings()
 
@@ -101,3 +106,133 @@ def test_strategy_finds_nearest_food(strategy):
     nearest = strategy.find_nearest_food(position, food_list)
     assert nearest["circle"]["x"] == -1
     assert nearest["circle"]["y"] == -1
+
+def _player(alive=True, x=0, y=0):
+    return {"playerName": "TestBot", "alive": alive, "circle": {"x": x, "y": y, "radius": 10}}
+
+@pytest.mark.asyncio
+async def test_game_client_debounces_respawn_joins():
+    client = GameClient("game1", "TestBot", respawn_delay=0.5, respawn_timeout=2.0)
+    client.ws = MagicMock()
+    with patch("src.bot.game_client.time.monotonic", return_value=100.0):
+        await client.send_join_message()
+        client.player_data = _player(alive=True)
+        await client.update_respawn()
+    assert client.respawn_state is RespawnState.ALIVE
+
+    # Death is noticed, but no join is sent until the respawn delay has passed
+    client.player_data = _player(alive=False)
+    with patch("src.bot.game_client.time.monotonic", return_value=110.0):
+        for _ in range(20):
+            await client.update_respawn()
+    assert client.respawn_state is RespawnState.DEAD
+    assert client.join_messages_sent == 1
+
+    with patch("src.bot.game_client.time.monotonic", return_value=110.5):
+        for _ in range(20):
+            await client.update_respawn()
+    assert client.respawn_state is RespawnState.JOIN_PENDING
+    assert client.join_messages_sent == 2
+
+    # An unacknowledged join is retried after the timeout
+    with patch("src.bot.game_client.time.monotonic", return_value=112.5):
+        await client.update_respawn()
+    assert client.join_messages_sent == 3
+    assert client.join_retries == 1
+
+    client.player_data = _player(alive=True)
+    with patch("src.bot.game_client.time.monotonic", return_value=113.0):
+        await client.update_respawn()
+    assert client.respawn_state is RespawnState.ALIVE
+    assert client.respawns == 1
+    assert client.last_respawn_latency == pytest.approx(3.0)
+
+@pytest.mark.asyncio
+async def test_game_client_send_queue_drops_oldest_moves_but_keeps_joins():
+    client = GameClient("game1", "TestBot", send_queue_size=2)
+    client.ws = MagicMock()
+    client.ws.send = AsyncMock()
+
+    await client.send_join_message()
+    for i in range(5):
+        await client.send_message({"type": "move", "data": {"x": i, "y": 0}})
+    await client.send_join_message()
+
+    assert client.queue_depth == 4
+    assert client.dropped_moves == 3
+
+    writer = asyncio.create_task(client.write_messages())
+    while client.queue_depth:
+        await asyncio.sleep(0)
+    writer.cancel()
+
+    sent = [json.loads(call.args[0]) for call in client.ws.send.await_args_list]
+    assert [m["type"] for m in sent] == ["join", "join", "move", "move"]
+    assert [m["data"]["x"] for m in sent[2:]] == [3, 4]
+    assert client.messages_sent == 4
+    assert client.moves_sent == 2
+
+def test_send_queue_size_must_hold_a_move():
+    with pytest.raises(ValidationError):
+        Settings(send_queue_size=0)
+
+def test_game_client_attributes_time_and_logs_slow_ticks(caplog):
+    client = GameClient("game1", "TestBot", slow_tick_threshold=0.05)
+    client.record_message_time(0.001, 0.002)
+    client.record_move_time(0.004)
+    assert client.messages_received == 1
+    assert client.moves_calculated == 1
+    assert client.cpu_seconds == pytest.approx(0.007)
+    assert not caplog.records
+
+    with caplog.at_level("WARNING", logger="src.bot.game_client"):
+        client.record_move_time(0.06)
+    assert "TestBot" in caplog.text and "game1" in caplog.text
+    assert client.max_tick_seconds == pytest.approx(0.06)
+
+def test_bot_manager_reports_hottest_bots_first():
+    manager = ServiceBotManager(settings)
+    for bot_id, game_id, seconds in [("cold", "game1", 0.1), ("hot", "game2", 3.0), ("warm", "game1", 1.0)]:
+        client = GameClient(game_id, bot_id)
+        client.record_move_time(seconds)
+        manager._game_clients[bot_id] = client
+
+    stats = manager.get_bot_stats(top_n=2)
+    assert [b.bot_id for b in stats.bots] == ["hot", "warm"]
+    assert stats.bots[0].move_seconds == pytest.approx(3.0)
+    assert [(g.game_id, g.bots) for g in stats.games] == [("game2", 1), ("game1", 2)]
+    assert stats.games[1].total_seconds == pytest.approx(1.1)
+    assert len(manager.get_bot_stats().bots) == 3
+
+def test_loop_factory_falls_back_to_asyncio():
+    assert get_loop_factory("asyncio") is asyncio.new_event_loop
+    assert get_loop_factory("unknown") is asyncio.new_event_loop
+    with patch.dict("sys.modules", {"uvloop": None}):
+        assert get_loop_factory("auto") is asyncio.new_event_loop
+        assert get_loop_factory("uvloop") is asyncio.new_event_loop
+
+@pytest.mark.asyncio
+async def test_game_loop_decides_after_updates_at_difficulty_rate():
+    client = GameClient("tick-game", "TestBot", strategy="greedy", difficulty="easy")
+    assert client.decision_every == settings.decision_every["easy"] == 3
+    client.ws = MagicMock()
+    client.connected = True
+    client.respawn_state = RespawnState.ALIVE
+    client.world.reset({"players": [_player()], "food": [{"index": 0, "circle": {"x": 3, "y": 4, "radius": 1}}]})
+    client.player_data = client.world.player("TestBot")
+
+    loop_task = asyncio.create_task(client.game_loop())
+    try:
+        for tick in range(6):
+            with patch("src.bot.game_client.time.monotonic", return_value=10 + tick * 0.05):
+                client.record_frame("update")
+            for _ in range(5):
+                await asyncio.sleep(0)
+            # no moves are sent between updates
+            assert client.moves_calculated == (tick + 1) // 3
+    finally:
+        client.connected = False
+        loop_task.cancel()
+
+    assert client.update_interval == pytest.approx(0.05)
+    assert [m["data"] for m in client._move_queue] == [{"x": 0.6, "y": 0.8}] * 2
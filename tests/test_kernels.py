@@ -0,0 +1,127 @@
+import math
+import random
+
+import pytest
+
+from src.bot.kernels import NumpyFoodIndex, PythonFoodIndex, get_food_index_class, normalize
+from src.bot.strategy import BotStrategy
+
+
+@pytest.fixture
+def numpy():
+    return pytest.importorskip("numpy")
+
+
+def _random_food(rng, count, integer):
+    food = []
+    for i in range(count):
+        if integer:
+            # small integer grid, so ties between equidistant food are common
+            x, y = rng.randint(-5, 5), rng.randint(-5, 5)
+        else:
+            x, y = rng.uniform(-1e4, 1e4), rng.uniform(-1e4, 1e4)
+        food.append({"index": i, "circle": {"x": x, "y": y, "radius": 1}})
+    return food
+
+
+def _reference_nearest(x, y, food):
+    best, best_distance = None, math.inf
+    for i, f in enumerate(food):
+        dx = f["circle"]["x"] - x
+        dy = f["circle"]["y"] - y
+        if dx * dx + dy * dy < best_distance:
+            best, best_distance = i, dx * dx + dy * dy
+    return best
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_food_index_kernels_agree(seed, numpy):
+    rng = random.Random(seed)
+    food = _random_food(rng, rng.randint(0, 300), integer=seed % 2 == 0)
+    python_index, numpy_index = PythonFoodIndex(), NumpyFoodIndex()
+    python_index.reset(food)
+    numpy_index.reset(food)
+
+    for _ in range(20):
+        if food and rng.random() < 0.5:
+            i = rng.randrange(len(food))
+            food[i] = {"index": i, "circle": {"x": rng.randint(-5, 5), "y": rng.uniform(-5, 5), "radius": 1}}
+            python_index.set(i, food[i]["circle"]["x"], food[i]["circle"]["y"])
+            numpy_index.set(i, food[i]["circle"]["x"], food[i]["circle"]["y"])
+
+        x, y = rng.uniform(-6, 6), rng.randint(-6, 6)
+        expected = _reference_nearest(x, y, food)
+        assert python_index.nearest(x, y) == expected
+        assert numpy_index.nearest(x, y) == expected
+        if expected is not None:
+            px, py = python_index.position(expected)
+            nx, ny = numpy_index.position(expected)
+            assert normalize(nx - x, ny - y) == normalize(px - x, py - y)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_python_food_index_finds_first_nearest(seed):
+    rng = random.Random(seed)
+    food = _random_food(rng, rng.randint(0, 300), integer=seed % 2 == 0)
+    index = PythonFoodIndex()
+    index.reset(food)
+    for _ in range(20):
+        x, y = rng.uniform(-6, 6), rng.randint(-6, 6)
+        assert index.nearest(x, y) == _reference_nearest(x, y, food)
+
+
+def test_normalize():
+    assert normalize(3, 4) == (0.6, 0.8)
+    assert normalize(0, 0) == (0, 0)
+
+
+def test_python_food_index_set_grows_index():
+    index = PythonFoodIndex()
+    index.set(3, 1.0, 1.0)
+    assert len(index) == 4
+    assert index.nearest(0, 0) == 3
+
+
+def test_numpy_food_index_set_grows_index(numpy):
+    index = NumpyFoodIndex()
+    index.set(3, 1.0, 1.0)
+    assert len(index) == 4
+    assert index.nearest(0, 0) == 3
+
+
+def test_kernel_backend_selection():
+    assert get_food_index_class("python") is PythonFoodIndex
+    assert get_food_index_class("missing") is PythonFoodIndex
+
+
+def test_kernel_backend_prefers_numpy(numpy):
+    assert get_food_index_class("auto") is NumpyFoodIndex
+    assert get_food_index_class("numpy") is NumpyFoodIndex
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_strategy_finds_first_nearest_food(seed):
+    rng = random.Random(seed)
+    food = _random_food(rng, 100, integer=True)
+    position = {"x": rng.randint(-5, 5), "y": rng.randint(-5, 5)}
+    expected = food[_reference_nearest(position["x"], position["y"], food)]
+    assert BotStrategy("python").find_nearest_food(position, food) is expected
+
+    index = PythonFoodIndex()
+    index.reset(food)
+    assert BotStrategy("python").find_nearest_food(position, food, index) is expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_strategy_backends_agree(seed, numpy):
+    rng = random.Random(seed)
+    food = _random_food(rng, 100, integer=True)
+    position = {"x": rng.randint(-5, 5), "y": rng.randint(-5, 5)}
+    expected = food[_reference_nearest(position["x"], position["y"], food)]
+    for backend in ("python", "numpy"):
+        strategy = BotStrategy(backend)
+        index = strategy.food_index_class()
+        index.reset(food)
+        assert strategy.find_nearest_food(position, food, index) is expected
+        # without a maintained index every backend searches the list
+        assert strategy.find_nearest_food(position, food) is expected
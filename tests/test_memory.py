@@ -0,0 +1,181 @@
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from src.bot.bot_manager import BotInstance
+from src.bot.game_client import GameClient
+
+FOOD = [{"index": i, "circle": {"x": i * 1.5, "y": i * 0.5, "radius": 5}} for i in range(200)]
+GAME_STATE = json.dumps({"type": "gameState", "data": {"players": [], "food": FOOD}})
+
+# Upper bound for what a bot may cost on top of the shared world
+MAX_BYTES_PER_BOT = 2048
+
+
+def _game_state(food_x=0, players=("a",)):
+    food = [{"index": 0, "circle": {"x": food_x, "y": 0, "radius": 5}}]
+    players = [_player(name, 0) for name in players]
+    return json.dumps({"type": "gameState", "data": {"players": players, "food": food}})
+
+
+def _update(x=None, food_x=None):
+    data = {}
+    if x is not None:
+        data["players"] = [_player("a", x)]
+    if food_x is not None:
+        data["food"] = [{"index": 0, "circle": {"x": food_x, "y": 0, "radius": 5}}]
+    return json.dumps({"type": "update", "data": data})
+
+
+def _player(name, x):
+    return {"playerName": name, "alive": True, "circle": {"x": x, "y": 0, "radius": 10}}
+
+
+async def _footprint(bots: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        clients = []
+        for i in range(bots):
+            client = GameClient("memory-game", f"bot-{i}", strategy="greedy")
+            await client.handle_frame(GAME_STATE)
+            clients.append(client)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+async def test_memory_per_bot_stays_flat():
+    one = await _footprint(1)
+    hundred = await _footprint(100)
+    thousand = await _footprint(1000)
+    # every bot past the hundredth only pays for its own client
+    per_bot = (thousand - hundred) / 900
+    assert per_bot < MAX_BYTES_PER_BOT, f"{per_bot:.0f} bytes per bot between 100 and 1000 bots"
+    # a single bot pays for the world, the first hundred add the standby's copy of it
+    shared = hundred - 99 * per_bot
+    assert shared < 2.5 * one, f"{shared:.0f} bytes shared by 100 bots, {one} for one bot"
+
+
+@pytest.mark.asyncio
+async def test_bots_in_a_game_share_world_and_strings():
+    a = GameClient("".join(["shared", "-game"]), "a", strategy="greedy")
+    b = GameClient("".join(["shared", "-game"]), "b", strategy="".join(["gre", "edy"]))
+    other = GameClient("other-game", "c")
+    assert a.world is b.world
+    assert a.world is not other.world
+    assert a.game_id is b.game_id
+    assert a.strategy is b.strategy
+
+    await a.handle_frame(GAME_STATE)
+    await b.handle_frame(GAME_STATE)
+    assert b.game_state["food"] is a.game_state["food"]
+    assert len(other.game_state["food"]) == 0
+
+    with pytest.raises(AttributeError):
+        a.unexpected = True
+    with pytest.raises(AttributeError):
+        BotInstance("game1", "bot").unexpected = True
+
+
+@pytest.mark.asyncio
+async def test_single_bot_applies_repeated_frames():
+    client = GameClient("repeat-game", "a")
+    await client.handle_frame(_game_state())
+    for frame in (_update(x=1), _update(x=2), _update(x=1)):
+        await client.handle_frame(frame)
+    assert client.world.player("a")["circle"]["x"] == 1
+
+
+@pytest.mark.asyncio
+async def test_late_game_state_of_another_bot_does_not_rewind_the_world():
+    a = GameClient("late-game", "a")
+    b = GameClient("late-game", "b")
+    snapshot, u1 = _game_state(food_x=0), _update(food_x=5)
+
+    await a.handle_frame(snapshot)
+    await a.handle_frame(u1)
+    # b joined before u1 but its snapshot arrives after a applied u1
+    await b.handle_frame(snapshot)
+    await b.handle_frame(u1)
+    assert a.world.food[0]["circle"]["x"] == 5
+    assert b.player_data == a.world.player("b")
+
+
+@pytest.mark.asyncio
+async def test_lagging_bot_does_not_move_the_world_backwards():
+    a = GameClient("lag-game", "a")
+    b = GameClient("lag-game", "b")
+    frames = [_game_state()] + [_update(x=x) for x in range(1, 40)]
+    for frame in frames:
+        await a.handle_frame(frame)
+    for frame in frames[:5]:
+        await b.handle_frame(frame)
+    assert a.world.player("a")["circle"]["x"] == 39
+
+
+@pytest.mark.asyncio
+async def test_next_bot_with_a_game_state_takes_over_the_world():
+    a = GameClient("handover-game", "a")
+    b = GameClient("handover-game", "b")
+    c = GameClient("handover-game", "c")
+    await a.handle_frame(_game_state())
+    await c.handle_frame(_update(x=7))
+    await b.handle_frame(_game_state())
+    assert a.world.feeder is a
+
+    a.world.release(a)
+    # c never received a game state, so it cannot continue the stream
+    await c.handle_frame(_update(x=8))
+    assert b.world.player("a")["circle"]["x"] == 0
+    await b.handle_frame(_update(x=9))
+    assert b.world.feeder is b
+    assert b.world.player("a")["circle"]["x"] == 9
+
+
+@pytest.mark.asyncio
+async def test_bot_takes_its_player_from_its_own_game_state():
+    a = GameClient("join-game", "a")
+    b = GameClient("join-game", "b")
+    c = GameClient("join-game", "c")
+    await a.handle_frame(_game_state())
+    # b and c joined later, only their own snapshots and no update so far have them in it
+    await b.handle_frame(_game_state(players=("a", "b")))
+    await c.handle_frame(_game_state(players=("a", "b", "c")))
+    assert (a.world.feeder, a.world.standby) == (a, b)
+    for frame in (_update(x=1), _update(food_x=2)):
+        for client in (a, b, c):
+            await client.handle_frame(frame)
+    assert b.player_data == _player("b", 0)
+    assert c.player_data == _player("c", 0)
+    assert b.alive and c.alive
+
+
+@pytest.mark.asyncio
+async def test_standby_takes_over_without_losing_updates():
+    c = GameClient("standby-game", "c")
+    d = GameClient("standby-game", "d")
+    await c.handle_frame(_game_state())
+    await d.handle_frame(_game_state())
+    assert (c.world.feeder, c.world.standby) == (c, d)
+
+    # d received an update that c never will
+    await d.handle_frame(_update(food_x=50))
+    assert c.world.food[0]["circle"]["x"] == 0
+    c.world.release(c)
+    assert d.world.feeder is d
+    assert d.world.food[0]["circle"]["x"] == 50
+    assert d.world.food_index.position(d.world.food_index.nearest(0, 0)) == (50, 0)
+
+    # without a standby the world waits for the next game state
+    d.world.release(d)
+    e = GameClient("standby-game", "e")
+    await e.handle_frame(_update(food_x=60))
+    assert e.world.feeder is None
+    assert e.world.food[0]["circle"]["x"] == 50
+    await e.handle_frame(_game_state(food_x=70))
+    assert e.world.feeder is e
+    assert e.world.food[0]["circle"]["x"] == 70
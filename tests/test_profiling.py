@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+from src.profiling import Profiler, ProfilerBusyError
+
+
+async def _busy_bot(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(i * i for i in range(2000))
+        await asyncio.sleep(0)
+
+
+async def _allocating_bot(seconds, kept):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        kept.append(bytearray(1024))
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_cpu_profile_returns_collapsed_stacks():
+    profiler = Profiler()
+    busy = asyncio.create_task(_busy_bot(0.4))
+    collapsed = await profiler.capture("cpu", 0.3, interval=0.002)
+    await busy
+
+    lines = collapsed.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+    assert any("_busy_bot (tests/test_profiling.py:" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_reports_allocation_sites():
+    kept = []
+    allocating = asyncio.create_task(_allocating_bot(0.3, kept))
+    report = await Profiler().capture("memory", 0.2, limit=5)
+    await allocating
+
+    assert "test_profiling.py" in report
+    assert len(report.splitlines()) <= 6
+
+
+@pytest.mark.asyncio
+async def test_profiler_runs_one_bounded_capture_at_a_time():
+    profiler = Profiler(max_seconds=0.1)
+    with pytest.raises(ValueError):
+        await profiler.capture("wall", 1)
+
+    started = time.monotonic()
+    first = asyncio.create_task(profiler.capture("cpu", 60))
+    await asyncio.sleep(0)
+    with pytest.raises(ProfilerBusyError):
+        await profiler.capture("cpu", 1)
+    await first
+    assert time.monotonic() - started < 1
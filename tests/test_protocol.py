@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+import websockets
+
+from src.bot.game_client import GameClient
+from src.bot.protocol import JSON_SUBPROTOCOL, PROTOBUF_SUBPROTOCOL, JsonCodec, ProtobufCodec
+
+GAME_STATE = {
+    "type": "gameState",
+    "data": {
+        "players": [{"playerName": "TestBot", "alive": True, "circle": {"x": 1.5, "y": 2.0, "radius": 10.0}}],
+        "food": [
+            {"index": 0, "circle": {"x": 5.0, "y": 5.0, "radius": 1.0}},
+            {"index": 1, "circle": {"x": -3.0, "y": 4.0, "radius": 1.0}},
+        ],
+    },
+}
+
+
+async def _fake_game_server(subprotocols):
+    """Start a game server that answers a join with the full game state."""
+    received = []
+
+    async def handler(ws):
+        codec = ProtobufCodec() if ws.subprotocol == PROTOBUF_SUBPROTOCOL else JsonCodec()
+        async for frame in ws:
+            message = codec.decode(frame)
+            received.append((type(frame), message))
+            if message["type"] == "join":
+                await ws.send(codec.encode(GAME_STATE))
+
+    server = await websockets.serve(handler, "localhost", 0, subprotocols=subprotocols)
+    port = server.sockets[0].getsockname()[1]
+    return server, port, received
+
+
+async def _join_and_receive_state(client, received):
+    assert await client.connect()
+    writer = asyncio.create_task(client.write_messages())
+    reader = asyncio.create_task(client.handle_messages())
+    try:
+        for _ in range(200):
+            if client.player_data and received:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        writer.cancel()
+        reader.cancel()
+        await client.ws.close()
+
+
+def test_protobuf_codec_round_trips_game_messages():
+    codec = ProtobufCodec()
+    messages = [
+        GAME_STATE,
+        {"type": "update", "data": {"players": [], "food": [{"index": 1, "circle": {"x": 0.0, "y": 1.0, "radius": 2.0}}]}},
+        {"type": "spawn", "data": GAME_STATE["data"]["players"][0]},
+        {"type": "join", "data": {"playerName": "TestBot"}},
+        {"type": "move", "data": {"x": 0.6, "y": -0.8}},
+    ]
+    for message in messages:
+        frame = codec.encode(message)
+        assert isinstance(frame, bytes)
+        assert codec.decode(frame) == message
+    assert len(codec.encode(GAME_STATE)) < len(JsonCodec().encode(GAME_STATE))
+
+
+@pytest.mark.asyncio
+async def test_game_client_negotiates_protobuf():
+    server, port, received = await _fake_game_server([PROTOBUF_SUBPROTOCOL, JSON_SUBPROTOCOL])
+    try:
+        client = GameClient("game1", "TestBot", game_port=port, protocol="protobuf")
+        await _join_and_receive_state(client, received)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert client.codec.name == "protobuf"
+    assert received == [(bytes, {"type": "join", "data": {"playerName": "TestBot"}})]
+    assert client.player_data["circle"] == {"x": 1.5, "y": 2.0, "radius": 10.0}
+    assert len(client.game_state["food"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_game_client_falls_back_to_json():
+    server, port, received = await _fake_game_server(None)
+    try:
+        client = GameClient("game1", "TestBot", game_port=port, protocol="protobuf")
+        await _join_and_receive_state(client, received)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert client.codec.name == "json"
+    assert received == [(str, {"type": "join", "data": {"playerName": "TestBot"}})]
+    assert client.player_data["alive"]
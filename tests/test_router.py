@@ -0,0 +1,196 @@
+from collections import Counter
+
+import grpc
+import pytest
+
+from src.bot.hash_ring import HashRing
+from src.bot.router import RouterServicer
+from src.config.settings import Settings
+from src.proto import bot_pb2
+
+settings = Settings()
+
+GAMES = [f"game{i}" for i in range(200)]
+
+pytestmark = pytest.mark.usefixtures("fake_game_client")
+
+
+def test_ring_places_keys_consistently():
+    ring = HashRing(["a:1", "b:1", "c:1"])
+    placed = {game: ring.lookup(game) for game in GAMES}
+    assert placed == {game: HashRing(["c:1", "a:1", "b:1"]).lookup(game) for game in GAMES}
+    assert set(placed.values()) == {"a:1", "b:1", "c:1"}
+    assert sorted(ring.candidates("game1")) == ["a:1", "b:1", "c:1"]
+
+
+def test_adding_a_replica_only_moves_keys_to_it():
+    ring = HashRing(["a:1", "b:1", "c:1"])
+    before = {game: ring.lookup(game) for game in GAMES}
+    ring.add("d:1")
+    after = {game: ring.lookup(game) for game in GAMES}
+    moved = [game for game in GAMES if before[game] != after[game]]
+    assert moved and all(after[game] == "d:1" for game in moved)
+    # roughly a quarter of the keys move
+    assert len(moved) < len(GAMES) / 2
+
+    ring.remove("d:1")
+    assert {game: ring.lookup(game) for game in GAMES} == before
+
+
+def test_bounded_load_spills_over_to_next_replica():
+    ring = HashRing(["a:1", "b:1", "c:1"], load_factor=1.25)
+    loads = Counter()
+    for game in GAMES:
+        loads[ring.lookup(game, loads)] += 1
+        assert max(loads.values()) <= ring.capacity(sum(loads.values()) - 1)
+
+    first, second = list(ring.candidates("game1"))[:2]
+    assert ring.lookup("game1", {first: 10, second: 0}) == second
+    assert ring.lookup("game1", exclude=[first]) == second
+    with pytest.raises(ValueError):
+        ring.lookup("game1", exclude=["a:1", "b:1", "c:1"])
+    with pytest.raises(ValueError):
+        HashRing(load_factor=0.5)
+
+
+def test_busy_game_spills_over_within_load_bound():
+    router = RouterServicer(settings, ["a:1", "b:1", "c:1"])
+    for i in range(10):
+        router.record(f"other{i}", f"game{i}", router.place(f"game{i}"))
+    for i in range(30):
+        replica = router.place("busy")
+        assert router.loads[replica] < router.ring.capacity(sum(router.loads.values()))
+        router.record(f"busy{i}", "busy", replica)
+
+    busy = Counter(replica for game_id, replica in router.bots.values() if game_id == "busy")
+    assert len(busy) > 1
+    assert max(router.loads.values()) <= router.ring.capacity(sum(router.loads.values()) - 1)
+
+
+async def _start_replicas(start_service, count):
+    started = [await start_service() for _ in range(count)]
+    return tuple(list(column) for column in zip(*started))
+
+
+def _create(bot_id, game_id):
+    return bot_pb2.CreateBotRequest(bot_id=bot_id, bot=bot_pb2.Bot(game_id=game_id), access_token="token")
+
+
+class FakeContext:
+    code = None
+    details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+
+@pytest.mark.asyncio
+async def test_router_keeps_games_together(start_service):
+    servers, replicas, addresses = await _start_replicas(start_service, 3)
+    router = RouterServicer(settings, addresses)
+    try:
+        for i in range(60):
+            await router.CreateBot(_create(f"b{i}", f"game{i % 12}"), FakeContext())
+
+        for replica in replicas:
+            games = {bot.game_id for bot in replica.bot_manager._bots.values()}
+            others = [r for r in replicas if r is not replica]
+            assert not any(bot.game_id in games for r in others for bot in r.bot_manager._bots.values())
+        assert all(replica.bot_manager._bots for replica in replicas)
+        assert sum(router.loads.values()) == 60
+
+        listed = await router.ListBots(bot_pb2.ListBotsRequest(), FakeContext())
+        assert len(listed.bots) == 60
+        stats = await router.GetBotStats(bot_pb2.GetBotStatsRequest(), FakeContext())
+        assert sorted(game.bots for game in stats.games) == [5] * 12
+        assert (await router.GetBot(bot_pb2.GetBotRequest(bot_id="b7"), FakeContext())).game_id == "game7"
+
+        # a restarted router learns the placements from the replicas
+        restarted = RouterServicer(settings, addresses)
+        await restarted.sync()
+        assert restarted.games == router.games
+        assert restarted.loads == router.loads
+
+        await router.DeleteBot(bot_pb2.DeleteBotRequest(bot_id="b0"), FakeContext())
+        assert "b0" not in router.bots
+        context = FakeContext()
+        await router.DeleteBot(bot_pb2.DeleteBotRequest(bot_id="b0"), context)
+        assert context.code == grpc.StatusCode.NOT_FOUND
+        await restarted.close()
+
+        # bots that end on a replica are forgotten on the next sync
+        ended = next(iter(replicas[0].bot_manager._bots))
+        await replicas[0].bot_manager.remove_bot(ended)
+        await router.sync()
+        assert ended not in router.bots
+        assert sum(router.loads.values()) == 58
+    finally:
+        await router.close()
+        for server in servers:
+            await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_router_pages_across_replicas(start_service):
+    servers, replicas, addresses = await _start_replicas(start_service, 3)
+    router = RouterServicer(settings, addresses)
+    try:
+        for i in range(20):
+            await router.CreateBot(_create(f"b{i:02}", f"game{i}"), FakeContext())
+
+        listed, token = [], ""
+        while True:
+            request = bot_pb2.ListBotsRequest(page_size=3, page_token=token, field_mask={"paths": ["moves_sent"]})
+            page = await router.ListBots(request, FakeContext())
+            assert len(page.statuses) <= 3
+            assert not any(status.bot_id for status in page.statuses)
+            request.field_mask.paths.append("bot_id")
+            listed.extend(status.bot_id for status in (await router.ListBots(request, FakeContext())).statuses)
+            token = page.next_page_token
+            if not token:
+                break
+        assert listed == [f"b{i:02}" for i in range(20)]
+
+        router.max_page_size = 4
+        default = await router.ListBots(bot_pb2.ListBotsRequest(), FakeContext())
+        assert [status.bot_id for status in default.statuses] == [f"b{i:02}" for i in range(4)]
+        assert set(default.bots) == {f"b{i:02}" for i in range(4)}
+        assert not any(status.HasField("bot") for status in default.statuses)
+        assert default.next_page_token
+
+        context = FakeContext()
+        await router.ListBots(bot_pb2.ListBotsRequest(page_token="not a token"), context)
+        assert context.code == grpc.StatusCode.INVALID_ARGUMENT
+    finally:
+        await router.close()
+        for server in servers:
+            await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_router_moves_games_off_refusing_replicas(start_service):
+    servers, replicas, addresses = await _start_replicas(start_service, 2)
+    router = RouterServicer(settings, addresses)
+    try:
+        await router.CreateBot(_create("b1", "game1"), FakeContext())
+        owner = router.games["game1"]
+        draining = replicas[addresses.index(owner)]
+        draining.bot_manager.draining = True
+
+        context = FakeContext()
+        await router.CreateBot(_create("b2", "game1"), context)
+        assert context.code is None
+        assert router.games["game1"] != owner
+        assert "b2" in replicas[1 - addresses.index(owner)].bot_manager._bots
+
+        replicas[1 - addresses.index(owner)].bot_manager.draining = True
+        context = FakeContext()
+        await router.CreateBot(_create("b3", "game1"), context)
+        assert context.code == grpc.StatusCode.UNAVAILABLE
+    finally:
+        await router.close()
+        for server in servers:
+            await server.stop(None)
@@ -0,0 +1,257 @@
+import asyncio
+
+import grpc
+import pytest
+
+from src.bot.game_client import RespawnState
+from src.bot.roster import RosterJournal
+from src.bot.service import BotManager, BotServiceServicer
+from src.config.settings import Settings
+from src.proto import bot_pb2, bot_pb2_grpc
+
+settings = Settings()
+
+pytestmark = pytest.mark.usefixtures("fake_game_client")
+
+
+@pytest.mark.asyncio
+async def test_remove_running_bot():
+    manager = BotManager(settings)
+    await manager.add_bot("b1", bot_pb2.Bot(game_id="game1"), "token")
+    await asyncio.sleep(0)
+    await manager.remove_bot("b1")
+    assert not manager._bots and not manager._tasks and not manager._game_clients
+
+
+@pytest.mark.asyncio
+async def test_drain_hands_off_bots_in_batches(start_service):
+    server, target, address = await start_service()
+    try:
+        source = BotServiceServicer(settings)
+        for i in range(5):
+            await source.bot_manager.add_bot(f"b{i}", bot_pb2.Bot(game_id="game1", strategy="greedy"), f"token{i}", "game-host")
+        # b3 is already active on the target, so its handoff fails and it stays here
+        await target.bot_manager.add_bot("b3", bot_pb2.Bot(game_id="game1"), "token3", "game-host")
+        target.bot_manager._game_clients["b3"].ws = object()
+
+        request = bot_pb2.DrainBotsRequest(target=address, batch_size=2, batch_interval_seconds=0.01)
+        progress = [p async for p in source.DrainBots(request, None)]
+    finally:
+        await server.stop(None)
+
+    assert [(p.migrated, p.failed, p.remaining) for p in progress] == [(2, 0, 3), (3, 1, 1), (4, 1, 0), (4, 1, 0)]
+    assert progress[-1].done
+    assert list(progress[-1].failed_bot_ids) == ["b3"]
+    assert list(source.bot_manager._bots) == ["b3"]
+
+    migrated = target.bot_manager._identities["b1"]
+    assert (migrated.access_token, migrated.hostname, migrated.bot.strategy) == ("token1", "game-host", "greedy")
+    assert target.bot_manager._game_clients["b1"].access_token == "token1"
+    assert set(target.bot_manager._bots) == {"b0", "b1", "b2", "b3", "b4"}
+
+
+@pytest.mark.asyncio
+async def test_draining_service_refuses_new_bots(start_service):
+    server, servicer, address = await start_service()
+    try:
+        servicer.bot_manager.draining = True
+        async with grpc.aio.insecure_channel(address) as channel:
+            stub = bot_pb2_grpc.BotServiceStub(channel)
+            with pytest.raises(grpc.aio.AioRpcError) as error:
+                await stub.CreateBot(bot_pb2.CreateBotRequest(bot_id="b1", bot=bot_pb2.Bot(game_id="game1")))
+    finally:
+        await server.stop(None)
+    assert error.value.code() == grpc.StatusCode.UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_list_bots_filters_and_pages():
+    manager = BotManager(settings)
+    for i in range(7):
+        await manager.add_bot(f"b{i}", bot_pb2.Bot(game_id=f"game{i % 2}"), "token")
+    manager._game_clients["b2"].respawn_state = RespawnState.DEAD
+    manager._game_clients["b3"].connected = False
+    await manager.remove_bot("b4")
+
+    pages, token = [], ""
+    while True:
+        page = manager.list_bots(bot_pb2.ListBotsRequest(page_size=2, page_token=token))
+        pages.append([status.bot_id for status in page.statuses])
+        token = page.next_page_token
+        if not token:
+            break
+    assert pages == [["b0", "b1"], ["b2", "b3"], ["b5", "b6"]]
+
+    game0 = manager.list_bots(bot_pb2.ListBotsRequest(game_id="game0"))
+    assert [status.bot_id for status in game0.statuses] == ["b0", "b2", "b6"]
+    assert set(game0.bots) == {"b0", "b2", "b6"}
+    # without a field mask the configs are only in the bots map
+    assert not any(status.HasField("bot") for status in game0.statuses)
+    assert game0.statuses[1].state == bot_pb2.BOT_STATE_DEAD
+    assert game0.statuses[0].last_message_age_seconds == -1
+
+    alive = manager.list_bots(bot_pb2.ListBotsRequest(state=bot_pb2.BOT_STATE_ALIVE))
+    assert [status.bot_id for status in alive.statuses] == ["b0", "b1", "b5", "b6"]
+    connecting = manager.list_bots(bot_pb2.ListBotsRequest(state=bot_pb2.BOT_STATE_CONNECTING))
+    assert [status.bot_id for status in connecting.statuses] == ["b3"]
+
+    masked = manager.list_bots(bot_pb2.ListBotsRequest(field_mask={"paths": ["bot_id", "alive"]}, page_size=1))
+    assert masked.statuses[0] == bot_pb2.BotStatus(bot_id="b0", alive=True)
+    assert not masked.bots
+    with_bot = manager.list_bots(bot_pb2.ListBotsRequest(field_mask={"paths": ["bot"]}, page_size=1))
+    assert with_bot.statuses[0].bot.game_id == "game0"
+    assert not with_bot.bots
+
+    manager.settings = settings.model_copy(update={"list_bots_max_page_size": 2})
+    capped = manager.list_bots(bot_pb2.ListBotsRequest())
+    assert [status.bot_id for status in capped.statuses] == ["b0", "b1"]
+    assert capped.next_page_token
+    assert len(manager.list_bots(bot_pb2.ListBotsRequest(page_size=5)).statuses) == 2
+    with pytest.raises(ValueError):
+        manager.list_bots(bot_pb2.ListBotsRequest(field_mask={"paths": ["access_token"]}))
+    with pytest.raises(ValueError):
+        manager.list_bots(bot_pb2.ListBotsRequest(page_token="not a token"))
+
+
+@pytest.mark.asyncio
+async def test_list_bots_accepts_empty_requests_of_older_clients(start_service):
+    server, servicer, address = await start_service()
+    try:
+        await servicer.bot_manager.add_bot("b1", bot_pb2.Bot(game_id="game1"), "token")
+        async with grpc.aio.insecure_channel(address) as channel:
+            list_bots = channel.unary_unary(
+                "/bot.BotService/ListBots",
+                request_serializer=bot_pb2.Empty.SerializeToString,
+                response_deserializer=bot_pb2.ListBotsResponse.FromString,
+            )
+            response = await list_bots(bot_pb2.Empty())
+    finally:
+        await server.stop(None)
+    assert response.bots["b1"].game_id == "game1"
+
+
+@pytest.mark.asyncio
+async def test_drain_to_unreachable_target_keeps_bots_running():
+    manager = BotManager(settings.model_copy(update={"drain_connect_timeout": 0.1}))
+    await manager.add_bot("b1", bot_pb2.Bot(game_id="game1"), "token")
+    client = manager._game_clients["b1"]
+
+    with pytest.raises(ConnectionError):
+        [p async for p in manager.drain("localhost:1", 10, 0)]
+    assert not manager.draining
+    assert manager._game_clients["b1"] is client
+
+
+@pytest.mark.asyncio
+async def test_drain_stops_after_a_failed_batch_and_accepts_bots_again(start_service):
+    server, target, address = await start_service()
+    try:
+        source = BotManager(settings)
+        for i in range(4):
+            await source.add_bot(f"b{i}", bot_pb2.Bot(game_id="game1"), "token")
+            # every bot is already active on the target
+            await target.bot_manager.add_bot(f"b{i}", bot_pb2.Bot(game_id="game1"), "token")
+            target.bot_manager._game_clients[f"b{i}"].ws = object()
+
+        progress = [p async for p in source.drain(address, 2, 0)]
+        assert len(progress) == 1
+        assert (progress[0].failed, progress[0].remaining, progress[0].done) == (2, 2, False)
+        assert progress[0].error
+        assert not source.draining
+
+        # a drain that is cancelled midway also leaves the draining state
+        drain = source.drain(address, 1, 10)
+        target.bot_manager._game_clients["b0"].ws = None
+        await target.bot_manager.remove_bot("b0")
+        await drain.__anext__()
+        assert source.draining
+        with pytest.raises(ValueError):
+            await source.drain(address, 1, 0).__anext__()
+        await drain.aclose()
+        assert not source.draining
+    finally:
+        await server.stop(None)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_drain_finishes_handoffs_in_flight(start_service):
+    server, target, address = await start_service()
+    try:
+        source = BotManager(settings)
+        for i in range(2):
+            await source.add_bot(f"b{i}", bot_pb2.Bot(game_id="game1"), "token")
+        arrived, release = asyncio.Event(), asyncio.Event()
+        add_bot = target.bot_manager.add_bot
+
+        async def slow_add_bot(bot_id, *args):
+            arrived.set()
+            await release.wait()
+            if bot_id == "b1":
+                raise ConnectionError("Game server refused b1")
+            return await add_bot(bot_id, *args)
+
+        target.bot_manager.add_bot = slow_add_bot
+        drain = asyncio.create_task(anext(source.drain(address, 2, 0)))
+        await arrived.wait()
+        drain.cancel()
+        await asyncio.sleep(0.01)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await drain
+        # every bot ends up in exactly one pod, b1 back here after the target refused it
+        assert list(target.bot_manager._bots) == ["b0"]
+        assert list(source._bots) == ["b1"]
+
+        # a bot that is gone by the time its handoff starts is skipped
+        async with grpc.aio.insecure_channel(address) as channel:
+            assert await source.handoff_bot("b0", bot_pb2_grpc.BotServiceStub(channel)) is None
+    finally:
+        await server.stop(None)
+
+
+def _identity(bot_id, game_id="game1"):
+    return bot_pb2.CreateBotRequest(
+        bot_id=bot_id, bot=bot_pb2.Bot(game_id=game_id, difficulty="easy"), access_token=f"token-{bot_id}", hostname="game-host"
+    )
+
+
+def test_roster_journal_replays_and_compacts(tmp_path):
+    path = tmp_path / "roster.jsonl"
+    journal = RosterJournal(str(path))
+    for bot_id in ("b1", "b2", "b3"):
+        journal.record_add(_identity(bot_id))
+    journal.record_remove("b2")
+    journal.close()
+    # a crash while writing leaves a partial last line
+    with open(path, "a") as file:
+        file.write('{"op": "add", "bot": {"bot_')
+
+    roster = RosterJournal(str(path)).load()
+    assert list(roster) == ["b1", "b3"]
+    assert roster["b3"] == _identity("b3")
+
+    journal.compact(roster.values())
+    assert len(path.read_text().splitlines()) == 2
+    assert RosterJournal(str(path)).load() == roster
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+@pytest.mark.asyncio
+async def test_bot_manager_restores_roster_after_restart(tmp_path):
+    journaled = Settings(roster_journal_path=str(tmp_path / "roster.jsonl"))
+    manager = BotManager(journaled)
+    for bot_id in ("b1", "b2", "b3"):
+        identity = _identity(bot_id)
+        await manager.add_bot(bot_id, identity.bot, identity.access_token, identity.hostname)
+    await manager.remove_bot("b2")
+    # simulate a crash: the bots are gone without being removed
+    for task in manager._tasks.values():
+        task.cancel()
+    manager.journal.close()
+
+    restarted = BotManager(journaled)
+    assert await restarted.restore(stagger=0) == 2
+    assert set(restarted._bots) == {"b1", "b3"}
+    assert restarted._identities["b3"] == _identity("b3")
+    assert restarted.restore_seconds is not None
+    assert len(restarted.journal.load()) == 2
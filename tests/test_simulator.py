@@ -0,0 +1,61 @@
+import pytest
+
+from src.sim.simulator import Simulator
+
+OUTCOME = ("ticks", "food_eaten", "kills", "respawns", "alive", "mean_radius", "max_radius")
+
+
+async def _run(ticks=30, **kwargs):
+    simulator = Simulator(**{"bots": 20, "food": 300, "world_size": 400, **kwargs})
+    return simulator, await simulator.run(ticks)
+
+
+@pytest.mark.asyncio
+async def test_simulation_is_reproducible():
+    _, first = await _run(seed=7)
+    _, second = await _run(seed=7)
+    _, other = await _run(seed=8)
+    assert [first[k] for k in OUTCOME] == [second[k] for k in OUTCOME]
+    assert [first[k] for k in OUTCOME] != [other[k] for k in OUTCOME]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("protocol", ["json", "protobuf"])
+async def test_bots_join_and_eat(protocol):
+    simulator, report = await _run(protocol=protocol)
+    assert report["ticks"] == 30
+    assert all(client.join_messages_sent >= 1 for client in simulator.clients)
+    assert all(client.moves_calculated > 0 for client in simulator.clients)
+    assert report["food_eaten"] > 0
+    assert report["mean_radius"] > 10
+
+
+@pytest.mark.asyncio
+async def test_protocols_reach_the_same_outcome():
+    _, json_report = await _run(protocol="json")
+    _, protobuf_report = await _run(protocol="protobuf")
+    assert json_report["food_eaten"] == protobuf_report["food_eaten"]
+
+
+@pytest.mark.asyncio
+async def test_separate_worlds_reach_the_same_outcome():
+    shared, shared_report = await _run()
+    separate, separate_report = await _run(shared_world=False)
+    assert [shared_report[k] for k in OUTCOME] == [separate_report[k] for k in OUTCOME]
+    assert len({id(client.world) for client in shared.clients}) == 1
+    assert len({id(client.world) for client in separate.clients}) == len(separate.clients)
+
+
+@pytest.mark.asyncio
+async def test_eaten_bots_respawn():
+    simulator, report = await _run(ticks=200, bots=30, food=50, world_size=300)
+    assert report["kills"] > 0
+    assert report["respawns"] > 0
+    assert sum(client.respawns for client in simulator.clients) > 0
+
+
+@pytest.mark.asyncio
+async def test_greedy_outgrows_random():
+    _, greedy = await _run(strategy="greedy")
+    _, random_ = await _run(strategy="random")
+    assert greedy["food_eaten"] > random_["food_eaten"]